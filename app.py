@@ -11,58 +11,87 @@ The app is organized using Flask blueprints by feature area:
 """
 import os
 import logging
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, render_template
 from flask_cors import CORS
+from flask_compress import Compress
 from dotenv import load_dotenv
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+from src.utils.json_utils import OrjsonProvider
+from src.utils.logging_setup import configure_logging
+
+# Configure logging (records are written by a background listener, not request threads)
+configure_logging(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
-app = Flask(__name__, static_folder='static', template_folder='templates')
-CORS(app)
+# Health payload never changes, so serialize it once instead of per probe
+_HEALTH_BODY = b'{"status":"healthy","service":"Pokemon Chat Demo"}'
+_HEALTH_HEADERS = {'Cache-Control': 'no-cache, no-store, must-revalidate'}
+
+
+def create_app() -> Flask:
+    """Create and configure the Flask application"""
+    app = Flask(__name__, static_folder='static', template_folder='templates')
+    app.json = OrjsonProvider(app)
+    # Keep keys in insertion order; sorting every payload is wasted work
+    app.json.sort_keys = False
+    CORS(app)
+
+    # Compress JSON and static text; SSE responses are streamed and left uncompressed
+    app.config.update(
+        COMPRESS_MIMETYPES=['application/json', 'text/html', 'text/css', 'text/javascript', 'application/javascript'],
+        COMPRESS_LEVEL=4,
+        COMPRESS_BR_LEVEL=4,
+        COMPRESS_STREAMS=False,
+    )
+    Compress(app)
+
+    # Register blueprints
+    from src.routes import chat_bp, realtime_bp, tool_bp, cache_bp, face_bp, pokeapi_bp
+
+    app.register_blueprint(chat_bp)
+    app.register_blueprint(realtime_bp)
+    app.register_blueprint(tool_bp)
+    app.register_blueprint(cache_bp)
+    app.register_blueprint(face_bp)
+    app.register_blueprint(pokeapi_bp)
 
-# Register blueprints
-from src.routes import chat_bp, realtime_bp, tool_bp, cache_bp, face_bp, pokeapi_bp
+    # Pay for the Azure chat singleton and its client at startup rather than on the first chat request
+    from azure_openai_chat import get_azure_chat
+    get_azure_chat().warm_up()
 
-app.register_blueprint(chat_bp)
-app.register_blueprint(realtime_bp)
-app.register_blueprint(tool_bp)
-app.register_blueprint(cache_bp)
-app.register_blueprint(face_bp)
-app.register_blueprint(pokeapi_bp)
+    @app.route('/')
+    def index():
+        """Serve the main page"""
+        return render_template('index.html')
 
+    @app.route('/api/health', methods=['GET'])
+    def health():
+        """
+        Health check endpoint for container readiness/liveness probes.
+        Returns quickly with minimal payload and proper headers.
+        """
+        return Response(_HEALTH_BODY, status=200, mimetype='application/json', headers=_HEALTH_HEADERS)
 
-@app.route('/')
-def index():
-    """Serve the main page"""
-    return render_template('index.html')
+    return app
 
 
-@app.route('/api/health', methods=['GET'])
-def health():
-    """
-    Health check endpoint for container readiness/liveness probes.
-    Returns quickly with minimal payload and proper headers.
-    """
-    response = jsonify({"status": "healthy", "service": "Pokemon Chat Demo"})
-    response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-    return response
+app = create_app()
 
 
 if __name__ == '__main__':
-    # Create necessary directories
-    os.makedirs('templates', exist_ok=True)
-    os.makedirs('static', exist_ok=True)
-    os.makedirs('static/css', exist_ok=True)
-    os.makedirs('static/js', exist_ok=True)
-    os.makedirs('profiles_pic', exist_ok=True)
-    os.makedirs('cache', exist_ok=True)
+    # Create necessary directories (makedirs creates 'static' along with its subfolders)
+    for directory in ('templates', 'static/css', 'static/js', 'profiles_pic', 'cache'):
+        os.makedirs(directory, exist_ok=True)
     
     # Run the app
     port = int(os.environ.get('PORT', 5000))
     debug_mode = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
-    app.run(host='0.0.0.0', port=port, debug=debug_mode)
+    if not debug_mode:
+        logger.info(
+            "Running the Flask development server. For production use gunicorn, e.g. "
+            "'gunicorn -c gunicorn.conf.py app:app'"
+        )
+    app.run(host='0.0.0.0', port=port, debug=debug_mode, threaded=True)
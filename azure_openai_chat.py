@@ -3,171 +3,200 @@ Azure OpenAI Integration for Pokemon Chat
 Uses LLM to understand natural language and call appropriate tools
 """
 import os
-import json
-from typing import Optional, Dict, Any, List
+import re
+import time
+import logging
+import threading
+import contextvars
+from types import SimpleNamespace
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Optional, Dict, Any, List, Iterator
+import orjson
 from openai import AzureOpenAI
 from dotenv import load_dotenv
 
+# Load .env before the src modules below read their settings at import time (scripts import this module directly)
 load_dotenv()
 
+from src.services.conversation_store import get_context_store  # noqa: E402
+from src.utils.api_settings import resolve_env_chat_config  # noqa: E402
+from src.utils.ttl_cache import TTLCache  # noqa: E402
 
-class AzureOpenAIChat:
-    """Handles chat with Azure OpenAI using function calling for Pokemon tools"""
-    
-    def __init__(self):
-        self.default_config = {
-            "endpoint": (os.getenv("AZURE_OPENAI_ENDPOINT", "") or "").rstrip('/'),
-            "api_key": os.getenv("AZURE_OPENAI_API_KEY", ""),
-            "deployment": os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4"),
-            "api_version": os.getenv("AZURE_OPENAI_API_VERSION", "2024-10-21")
-        }
-        self.default_client: Optional[AzureOpenAI] = None
-        self.conversation_history: Dict[str, List[Dict]] = {}
-        
-        # Define the tools/functions available to the LLM
-        self.tools = [
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_pokemon_info",
-                    "description": "Get detailed information about a Pokemon including stats, types, abilities, and description. Use this when the user asks about a specific Pokemon's data, stats, or general information.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "pokemon_name": {
-                                "type": "string",
-                                "description": "The name or ID of the Pokemon to look up (e.g., 'pikachu', 'charizard', '25')"
-                            }
-                        },
-                        "required": ["pokemon_name"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "search_pokemon_cards",
-                    "description": "Search for Pokemon Trading Card Game (TCG) cards. Use this when the user asks about Pokemon cards, trading cards, TCG, card prices, or wants to see card images.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "pokemon_name": {
-                                "type": "string",
-                                "description": "The Pokemon name to search cards for (e.g., 'pikachu', 'charizard')"
-                            },
-                            "card_type": {
-                                "type": "string",
-                                "description": "Filter by energy type: Fire, Water, Grass, Lightning, Psychic, Fighting, Darkness, Metal, Dragon, Fairy, Colorless",
-                                "enum": ["Fire", "Water", "Grass", "Lightning", "Psychic", "Fighting", "Darkness", "Metal", "Dragon", "Fairy", "Colorless"]
-                            },
-                            "hp_min": {
-                                "type": "integer",
-                                "description": "Minimum HP filter (e.g., 100 for cards with at least 100 HP)"
-                            },
-                            "hp_max": {
-                                "type": "integer",
-                                "description": "Maximum HP filter"
-                            },
-                            "rarity": {
-                                "type": "string",
-                                "description": "Card rarity filter (e.g., 'Rare', 'Rare Holo', 'Common')"
-                            }
-                        },
-                        "required": []
+logger = logging.getLogger(__name__)
+
+# Azure rejects histories with dangling tool calls using messages that mention "tool_call(s)"
+_TOOL_CALL_ERROR_RE = re.compile(r"tool_calls?", re.IGNORECASE)
+
+# Azure clients kept for reuse across requests (custom-mode users bring their own endpoint/key)
+AZURE_CLIENT_CACHE_SIZE = 32
+AZURE_CLIENT_CACHE_TTL = 3600
+# Longest a tool call may run, counted from when it starts, before it is reported as timed out
+TOOL_CALL_TIMEOUT_SECONDS = float(os.getenv("TOOL_CALL_TIMEOUT_SECONDS", "30"))
+# Tool calls a single assistant turn is expected to make at most
+TOOL_CALLS_PER_TURN = 4
+# Requests a worker serves at once: gevent connections or gthread threads (see gunicorn.conf.py)
+_CONCURRENT_REQUESTS = int(
+    os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000") if os.getenv("GUNICORN_WORKER_CLASS") == "gevent"
+    else os.getenv("GUNICORN_THREADS", "8")
+)
+# Shared pool for running tool calls, sized so every concurrent request can run a full turn of calls
+TOOL_CALL_WORKERS = int(os.getenv("TOOL_CALL_WORKERS", str(_CONCURRENT_REQUESTS * TOOL_CALLS_PER_TURN)))
+_TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=TOOL_CALL_WORKERS, thread_name_prefix="tool-call")
+
+# Which field of the chat result each tool's output is surfaced in (other tools only feed the model)
+_TOOL_RESULT_KEYS = {
+    "get_pokemon_info": "pokemon_data",
+    "get_random_pokemon": "pokemon_data",
+    "get_random_pokemon_from_region": "pokemon_data",
+    "get_random_pokemon_by_type": "pokemon_data",
+    "search_pokemon_cards": "tcg_data",
+}
+
+
+# Tools/functions available to the LLM; built once and shared by every request
+TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "get_pokemon_info",
+            "description": "Get detailed information about a Pokemon including stats, types, abilities, and description. Use this when the user asks about a specific Pokemon's data, stats, or general information.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "pokemon_name": {
+                        "type": "string",
+                        "description": "The name or ID of the Pokemon to look up (e.g., 'pikachu', 'charizard', '25')"
                     }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_pokemon_list",
-                    "description": "Get a list of Pokemon. Use this when the user asks for a list, wants to see available Pokemon, or asks for random Pokemon suggestions.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "limit": {
-                                "type": "integer",
-                                "description": "Number of Pokemon to return (default 10, max 50)",
-                                "default": 10
-                            },
-                            "offset": {
-                                "type": "integer",
-                                "description": "Starting position in the Pokemon list (for pagination)",
-                                "default": 0
-                            }
-                        },
-                        "required": []
+                },
+                "required": ["pokemon_name"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "search_pokemon_cards",
+            "description": "Search for Pokemon Trading Card Game (TCG) cards. Use this when the user asks about Pokemon cards, trading cards, TCG, card prices, or wants to see card images.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "pokemon_name": {
+                        "type": "string",
+                        "description": "The Pokemon name to search cards for (e.g., 'pikachu', 'charizard')"
+                    },
+                    "card_type": {
+                        "type": "string",
+                        "description": "Filter by energy type: Fire, Water, Grass, Lightning, Psychic, Fighting, Darkness, Metal, Dragon, Fairy, Colorless",
+                        "enum": ["Fire", "Water", "Grass", "Lightning", "Psychic", "Fighting", "Darkness", "Metal", "Dragon", "Fairy", "Colorless"]
+                    },
+                    "hp_min": {
+                        "type": "integer",
+                        "description": "Minimum HP filter (e.g., 100 for cards with at least 100 HP)"
+                    },
+                    "hp_max": {
+                        "type": "integer",
+                        "description": "Maximum HP filter"
+                    },
+                    "rarity": {
+                        "type": "string",
+                        "description": "Card rarity filter (e.g., 'Rare', 'Rare Holo', 'Common')"
                     }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_random_pokemon",
-                    "description": "Get a random Pokemon. Use this when the user wants to discover a random Pokemon or says 'surprise me'.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {},
-                        "required": []
+                },
+                "required": []
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_pokemon_list",
+            "description": "Get a list of Pokemon. Use this when the user asks for a list, wants to see available Pokemon, or asks for random Pokemon suggestions.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "limit": {
+                        "type": "integer",
+                        "description": "Number of Pokemon to return (default 10, max 50)",
+                        "default": 10
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "description": "Starting position in the Pokemon list (for pagination)",
+                        "default": 0
                     }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_random_pokemon_from_region",
-                    "description": "Get a random Pokemon from a specific region. Use when user asks for Pokemon from Kanto, Johto, Hoenn, Sinnoh, Unova, Kalos, Alola, Galar, or Paldea.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "region": {
-                                "type": "string",
-                                "description": "The Pokemon region (kanto, johto, hoenn, sinnoh, unova, kalos, alola, galar, paldea)",
-                                "enum": ["kanto", "johto", "hoenn", "sinnoh", "unova", "kalos", "alola", "galar", "paldea"]
-                            }
-                        },
-                        "required": ["region"]
+                },
+                "required": []
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_random_pokemon",
+            "description": "Get a random Pokemon. Use this when the user wants to discover a random Pokemon or says 'surprise me'.",
+            "parameters": {
+                "type": "object",
+                "properties": {},
+                "required": []
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_random_pokemon_from_region",
+            "description": "Get a random Pokemon from a specific region. Use when user asks for Pokemon from Kanto, Johto, Hoenn, Sinnoh, Unova, Kalos, Alola, Galar, or Paldea.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "region": {
+                        "type": "string",
+                        "description": "The Pokemon region (kanto, johto, hoenn, sinnoh, unova, kalos, alola, galar, paldea)",
+                        "enum": ["kanto", "johto", "hoenn", "sinnoh", "unova", "kalos", "alola", "galar", "paldea"]
                     }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_random_pokemon_by_type",
-                    "description": "Get a random Pokemon of a specific type. Use when user asks for a random Fire Pokemon, random Water Pokemon, etc.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "pokemon_type": {
-                                "type": "string",
-                                "description": "The Pokemon type",
-                                "enum": ["normal", "fire", "water", "grass", "electric", "ice", "fighting", "poison", "ground", "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark", "steel", "fairy"]
-                            }
-                        },
-                        "required": ["pokemon_type"]
+                },
+                "required": ["region"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_random_pokemon_by_type",
+            "description": "Get a random Pokemon of a specific type. Use when user asks for a random Fire Pokemon, random Water Pokemon, etc.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "pokemon_type": {
+                        "type": "string",
+                        "description": "The Pokemon type",
+                        "enum": ["normal", "fire", "water", "grass", "electric", "ice", "fighting", "poison", "ground", "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark", "steel", "fairy"]
                     }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_card_price",
-                    "description": "Get pricing information for a specific Pokemon TCG card by ID. Card ID format is 'set-number' (e.g., 'sv3-25'). Returns TCGPlayer and Cardmarket prices.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "card_id": {
-                                "type": "string",
-                                "description": "Card ID in format 'set-number' (e.g., 'sv3-25', 'base1-4')"
-                            }
-                        },
-                        "required": ["card_id"]
+                },
+                "required": ["pokemon_type"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_card_price",
+            "description": "Get pricing information for a specific Pokemon TCG card by ID. Card ID format is 'set-number' (e.g., 'sv3-25'). Returns TCGPlayer and Cardmarket prices.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "card_id": {
+                        "type": "string",
+                        "description": "Card ID in format 'set-number' (e.g., 'sv3-25', 'base1-4')"
                     }
-                }
+                },
+                "required": ["card_id"]
             }
-        ]
-        
-        self.system_prompt = """You are a friendly and knowledgeable Pokemon assistant. You help users learn about Pokemon, their stats, abilities, and trading cards.
+        }
+    }
+]
+
+SYSTEM_PROMPT = """You are a friendly and knowledgeable Pokemon assistant. You help users learn about Pokemon, their stats, abilities, and trading cards.
 
 You have access to tools to:
 1. Look up Pokemon information (stats, types, abilities, descriptions) - use get_pokemon_info
@@ -192,22 +221,35 @@ Guidelines:
 
 Keep responses concise but informative. Use emoji occasionally to be friendly! 🎮⚡"""
 
+
+class AzureOpenAIChat:
+    """Handles chat with Azure OpenAI using function calling for Pokemon tools"""
+    
+    def __init__(self):
+        self.default_config = {
+            "endpoint": (os.getenv("AZURE_OPENAI_ENDPOINT", "") or "").rstrip('/'),
+            "api_key": os.getenv("AZURE_OPENAI_API_KEY", ""),
+            "deployment": os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4"),
+            "api_version": os.getenv("AZURE_OPENAI_API_VERSION", "2024-10-21")
+        }
+        # One client (and so one keep-alive connection pool) per endpoint/key/version, shared by requests
+        self._clients = TTLCache(maxsize=AZURE_CLIENT_CACHE_SIZE, ttl=AZURE_CLIENT_CACHE_TTL)
+        self._clients_lock = threading.Lock()
+        # Recent user/assistant turns per user (Redis when REDIS_URL is set, so workers share them)
+        self.context_store = get_context_store()
+        
+        # Module-level constants keep the prompt prefix byte-identical across requests,
+        # which is what Azure OpenAI's automatic prompt caching keys on
+        self.tools = TOOLS
+        self.system_prompt = SYSTEM_PROMPT
+
     def get_conversation_history(self, user_id: str) -> List[Dict]:
-        """Get or initialize conversation history for a user"""
-        if user_id not in self.conversation_history:
-            self.conversation_history[user_id] = [
-                {"role": "system", "content": self.system_prompt}
-            ]
-        return self.conversation_history[user_id]
+        """Build this turn's message list: system prompt followed by the user's recent turns"""
+        return [{"role": "system", "content": self.system_prompt}] + self.context_store.messages(user_id)
     
     def add_message(self, user_id: str, role: str, content: str):
-        """Add a message to conversation history"""
-        history = self.get_conversation_history(user_id)
-        history.append({"role": role, "content": content})
-        
-        # Keep history manageable (last 20 messages + system prompt)
-        if len(history) > 21:
-            self.conversation_history[user_id] = [history[0]] + history[-20:]
+        """Add a message to conversation history (the store keeps the last MODEL_CONTEXT_MESSAGES)"""
+        self.context_store.append(user_id, role, content)
     
     def _get_client(self, override_config: Optional[Dict[str, str]] = None):
         cfg = (override_config or self.default_config).copy()
@@ -217,21 +259,140 @@ Keep responses concise but informative. Use emoji occasionally to be friendly! 
             raise ValueError(f"Azure OpenAI credentials missing: {', '.join(missing)}")
 
         api_version = cfg.get("api_version") or "2024-10-21"
-        if override_config:
-            client = AzureOpenAI(
-                azure_endpoint=cfg["endpoint"],
-                api_key=cfg["api_key"],
-                api_version=api_version
-            )
-            return client, cfg["deployment"]
+        client_key = (cfg["endpoint"], cfg["api_key"], api_version)
+        client = self._clients.get(client_key)
+        if client is None:
+            with self._clients_lock:
+                client = self._clients.get(client_key)
+                if client is None:
+                    client = AzureOpenAI(
+                        azure_endpoint=cfg["endpoint"],
+                        api_key=cfg["api_key"],
+                        api_version=api_version
+                    )
+                    self._clients.set(client_key, client)
+        return client, cfg["deployment"]
+
+    def warm_up(self):
+        """Build the client for the server-side (.env) credentials ahead of the first chat request"""
+        try:
+            # Same resolved settings "app" mode requests carry, so they hit the cached client
+            self._get_client(resolve_env_chat_config())
+        except ValueError:
+            # No server-side credentials; requests must bring their own Azure settings
+            pass
+
+    def _execute_tool_calls(self, history: List[Dict], assistant_message, tool_handlers: Dict[str, callable], result: Dict[str, Any]):
+        """Record the assistant's tool calls, run them and append their results to history"""
+        # Add assistant's message with tool calls to history
+        history.append({
+            "role": "assistant",
+            "content": assistant_message.content or "",
+            "tool_calls": [
+                {
+                    "id": tc.id,
+                    "type": "function",
+                    "function": {
+                        "name": tc.function.name,
+                        "arguments": tc.function.arguments
+                    }
+                }
+                for tc in assistant_message.tool_calls
+            ]
+        })
+
+        # Parse every call up front so independent tools can run concurrently
+        calls = []
+        for tool_call in assistant_message.tool_calls:
+            function_name = tool_call.function.name
+            try:
+                function_args = orjson.loads(tool_call.function.arguments)
+            except orjson.JSONDecodeError:
+                function_args = {}
+
+            result["tool_calls"].append({
+                "name": function_name,
+                "args": function_args
+            })
+            calls.append((tool_call, function_name, function_args))
+
+        runnable = [call for call in calls if call[1] in tool_handlers]
+        # Every call, even a lone one, runs on the pool so the deadline applies to it.
+        # Each task gets its own copy of the caller's context so Flask's g/request stay visible
+        started: Dict[str, float] = {}
 
-        if self.default_client is None:
-            self.default_client = AzureOpenAI(
-                azure_endpoint=cfg["endpoint"],
-                api_key=cfg["api_key"],
-                api_version=api_version
+        def run(call_id: str, function_name: str, function_args: Dict[str, Any]) -> Any:
+            started[call_id] = time.monotonic()
+            return self._run_tool(tool_handlers, function_name, function_args)
+
+        futures = {
+            tool_call.id: _TOOL_EXECUTOR.submit(
+                contextvars.copy_context().run, run, tool_call.id, function_name, function_args
             )
-        return self.default_client, cfg["deployment"]
+            for tool_call, function_name, function_args in runnable
+        }
+        # Each call's deadline runs from when it starts, so time queued behind other requests' calls
+        # doesn't count against it
+        pending = set(futures.values())
+        timed_out = set()
+        while pending:
+            now = time.monotonic()
+            deadlines = {
+                future: started[call_id] + TOOL_CALL_TIMEOUT_SECONDS
+                for call_id, future in futures.items()
+                if future in pending and call_id in started
+            }
+            expired = {future for future, deadline in deadlines.items() if deadline <= now}
+            timed_out |= expired
+            pending -= expired
+            if not pending:
+                break
+            remaining = min((deadline - now for deadline in deadlines.values() if deadline > now),
+                            default=TOOL_CALL_TIMEOUT_SECONDS)
+            _, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+
+        tool_results = {}
+        for tool_call, function_name, _ in runnable:
+            future = futures[tool_call.id]
+            if future in timed_out:
+                # The call finishes in the background, bounded by its HTTP timeouts
+                logger.warning("Tool %s did not finish within %ss; replying without its result",
+                               function_name, TOOL_CALL_TIMEOUT_SECONDS)
+                tool_results[tool_call.id] = {"error": f"{function_name} timed out"}
+            else:
+                tool_results[tool_call.id] = future.result()
+
+        # Append results in the order the model issued the calls
+        for tool_call, function_name, _ in calls:
+            if tool_call.id in tool_results:
+                tool_result = tool_results[tool_call.id]
+
+                # Store tool-specific data in result
+                result_key = _TOOL_RESULT_KEYS.get(function_name)
+                if result_key:
+                    result[result_key] = tool_result
+
+                # Add tool result to history
+                history.append({
+                    "role": "tool",
+                    "tool_call_id": tool_call.id,
+                    "content": orjson.dumps(tool_result, option=orjson.OPT_NON_STR_KEYS).decode() if tool_result else "No results found"
+                })
+            else:
+                history.append({
+                    "role": "tool",
+                    "tool_call_id": tool_call.id,
+                    "content": f"Tool {function_name} not available"
+                })
+
+    @staticmethod
+    def _run_tool(tool_handlers: Dict[str, callable], function_name: str, function_args: Dict[str, Any]) -> Any:
+        """Execute one tool handler, turning exceptions into an error result"""
+        try:
+            return tool_handlers[function_name](**function_args)
+        except Exception as tool_error:
+            logger.warning("Tool execution error for %s: %s", function_name, tool_error)
+            return {"error": str(tool_error)}
 
     def chat(self, message: str, user_id: str, tool_handlers: Dict[str, callable], client_config: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """
@@ -243,7 +404,7 @@ Keep responses concise but informative. Use emoji occasionally to be friendly! 
             tool_handlers: Dict mapping tool names to handler functions
             
         Returns:
-            Dict with response message and any tool data
+            Dict with response message and any tool data; "error" is set when the request failed
         """
         # Add user message to history
         self.add_message(user_id, "user", message)
@@ -253,7 +414,8 @@ Keep responses concise but informative. Use emoji occasionally to be friendly! 
             "message": "",
             "pokemon_data": None,
             "tcg_data": None,
-            "tool_calls": []
+            "tool_calls": [],
+            "error": None
         }
         
         try:
@@ -271,64 +433,7 @@ Keep responses concise but informative. Use emoji occasionally to be friendly! 
             
             # Check if the model wants to call tools
             if assistant_message.tool_calls:
-                # Add assistant's message with tool calls to history
-                history.append({
-                    "role": "assistant",
-                    "content": assistant_message.content or "",
-                    "tool_calls": [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments
-                            }
-                        }
-                        for tc in assistant_message.tool_calls
-                    ]
-                })
-                
-                # Process each tool call
-                for tool_call in assistant_message.tool_calls:
-                    function_name = tool_call.function.name
-                    try:
-                        function_args = json.loads(tool_call.function.arguments)
-                    except json.JSONDecodeError:
-                        function_args = {}
-                    
-                    result["tool_calls"].append({
-                        "name": function_name,
-                        "args": function_args
-                    })
-                    
-                    # Execute the tool if handler exists
-                    if function_name in tool_handlers:
-                        try:
-                            tool_result = tool_handlers[function_name](**function_args)
-                        except Exception as tool_error:
-                            print(f"Tool execution error for {function_name}: {tool_error}")
-                            tool_result = {"error": str(tool_error)}
-                        
-                        # Store tool-specific data in result
-                        if function_name == "get_pokemon_info":
-                            result["pokemon_data"] = tool_result
-                        elif function_name == "search_pokemon_cards":
-                            result["tcg_data"] = tool_result
-                        elif function_name in ["get_random_pokemon", "get_random_pokemon_from_region", "get_random_pokemon_by_type"]:
-                            result["pokemon_data"] = tool_result
-                        
-                        # Add tool result to history
-                        history.append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "content": json.dumps(tool_result) if tool_result else "No results found"
-                        })
-                    else:
-                        history.append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "content": f"Tool {function_name} not available"
-                        })
+                self._execute_tool_calls(history, assistant_message, tool_handlers, result)
                 
                 # Second API call to get final response with tool results
                 final_response = client.chat.completions.create(
@@ -347,21 +452,123 @@ Keep responses concise but informative. Use emoji occasionally to be friendly! 
         except Exception as e:
             error_msg = str(e)
             result["message"] = f"I'm sorry, I encountered an error: {error_msg}. Please try again!"
-            print(f"Azure OpenAI error: {e}")
+            result["error"] = error_msg
+            logger.error("Azure OpenAI error: %s", e)
             
             # If we get a tool_calls error, clear conversation history to reset state
-            if "tool_call" in error_msg.lower() or "tool_calls" in error_msg.lower():
-                print(f"Clearing conversation history for user {user_id} due to tool_calls error")
+            if _TOOL_CALL_ERROR_RE.search(error_msg):
+                logger.warning("Clearing conversation history for user %s due to tool_calls error", user_id)
                 self.clear_history(user_id)
         
         return result
     
+    @staticmethod
+    def _accumulate_tool_calls(tool_calls: Dict[int, SimpleNamespace], deltas) -> None:
+        """Merge streamed tool call fragments; ids and names arrive once, arguments in pieces"""
+        for fragment in deltas:
+            call = tool_calls.get(fragment.index)
+            if call is None:
+                call = tool_calls[fragment.index] = SimpleNamespace(
+                    id="", function=SimpleNamespace(name="", arguments="")
+                )
+            if fragment.id:
+                call.id = fragment.id
+            if fragment.function:
+                if fragment.function.name:
+                    call.function.name += fragment.function.name
+                if fragment.function.arguments:
+                    call.function.arguments += fragment.function.arguments
+
+    def chat_stream(self, message: str, user_id: str, tool_handlers: Dict[str, callable], client_config: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming variant of chat(): the answer is streamed from Azure OpenAI as it is
+        generated, with any tool calls resolved before the final answer is streamed
+        
+        Yields:
+            {"type": "delta", "text": str} for each piece of the answer, followed by
+            a single {"type": "done", ...} event carrying the same fields as chat()
+        """
+        self.add_message(user_id, "user", message)
+        history = self.get_conversation_history(user_id)
+        
+        result = {
+            "message": "",
+            "pokemon_data": None,
+            "tcg_data": None,
+            "tool_calls": [],
+            "error": None
+        }
+        
+        try:
+            client, deployment = self._get_client(client_config)
+            # First API call is streamed too: plain answers reach the client token by token,
+            # while tool call fragments are accumulated until the stream ends
+            stream = client.chat.completions.create(
+                model=deployment,
+                messages=history,
+                tools=self.tools,
+                tool_choice="auto",
+                max_completion_tokens=1000,
+                stream=True
+            )
+            
+            parts = []
+            tool_calls: Dict[int, SimpleNamespace] = {}
+            for chunk in stream:
+                # Azure sends content-filter chunks without choices
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta.tool_calls:
+                    self._accumulate_tool_calls(tool_calls, delta.tool_calls)
+                elif delta.content:
+                    parts.append(delta.content)
+                    yield {"type": "delta", "text": delta.content}
+            
+            if tool_calls:
+                assistant_message = SimpleNamespace(
+                    content="".join(parts),
+                    tool_calls=[tool_calls[index] for index in sorted(tool_calls)]
+                )
+                self._execute_tool_calls(history, assistant_message, tool_handlers, result)
+                
+                # Stream the final response with tool results
+                parts = []
+                stream = client.chat.completions.create(
+                    model=deployment,
+                    messages=history,
+                    max_completion_tokens=1000,
+                    stream=True
+                )
+                for chunk in stream:
+                    # Azure sends content-filter chunks without choices
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        parts.append(delta)
+                        yield {"type": "delta", "text": delta}
+            
+            result["message"] = "".join(parts)
+            self.add_message(user_id, "assistant", result["message"])
+                
+        except Exception as e:
+            error_msg = str(e)
+            result["message"] = f"I'm sorry, I encountered an error: {error_msg}. Please try again!"
+            result["error"] = error_msg
+            logger.error("Azure OpenAI error: %s", e)
+            yield {"type": "delta", "text": result["message"]}
+            
+            # If we get a tool_calls error, clear conversation history to reset state
+            if _TOOL_CALL_ERROR_RE.search(error_msg):
+                logger.warning("Clearing conversation history for user %s due to tool_calls error", user_id)
+                self.clear_history(user_id)
+        
+        yield {"type": "done", **result}
+    
     def clear_history(self, user_id: str):
         """Clear conversation history for a user"""
-        if user_id in self.conversation_history:
-            self.conversation_history[user_id] = [
-                {"role": "system", "content": self.system_prompt}
-            ]
+        self.context_store.clear(user_id)
 
 
 # Singleton instance
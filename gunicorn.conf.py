@@ -0,0 +1,30 @@
+"""
+Gunicorn configuration for the Pokemon Chat Demo
+
+Chat, face and MCP endpoints spend most of their time waiting on Azure OpenAI
+and other HTTP APIs, so each worker runs a pool of threads.
+Set GUNICORN_WORKER_CLASS=gevent to serve many concurrent /api/chat/stream
+clients per worker with greenlets instead (requires the gevent package; face
+identification is CPU-bound and will stall other requests on that worker).
+All values can be overridden through environment variables.
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '80')}"
+
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+# Simultaneous clients per worker for the gevent worker class (ignored by gthread)
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '1000'))
+# Import the app once in the master so workers fork with the tool schema, tool manager and
+# Azure chat singleton already built and share those pages copy-on-write. Off by default for
+# gevent, which has to patch the standard library before the app is imported.
+preload_app = os.getenv('GUNICORN_PRELOAD', 'false' if worker_class == 'gevent' else 'true').lower() == 'true'
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '30'))
+
+accesslog = '-'
+errorlog = '-'
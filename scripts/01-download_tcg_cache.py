@@ -60,10 +60,12 @@ TCG_API_BASE_URL = "https://api.pokemontcg.io/v2"
 TCG_API_ENDPOINT = f"{TCG_API_BASE_URL}/cards"
 
 
+# One pass replaces every run of non-alphanumerics (including repeated dashes) with a single dash
+SLUG_INVALID_RE = re.compile(r"[^a-z0-9]+")
+
+
 def slugify(value: str) -> str:
-    slug = re.sub(r"[^a-z0-9]+", "-", value.lower())
-    slug = re.sub(r"-+", "-", slug).strip('-')
-    return slug
+    return SLUG_INVALID_RE.sub("-", value.lower()).strip('-')
 
 
 def build_cache_filename(pokemon_number: int, pokemon_name: str) -> str:
@@ -38,6 +38,8 @@ DEFAULT_POKEMON_LIST = PROJECT_DIR / "data" / "pokemon_list.json"
 DEFAULT_DEST_DIR = PROJECT_DIR / "cache"
 FILENAME_RE = re.compile(r"^tcg-(\d{3})-([a-z0-9-]+)(?:-(\d{12}))?\.json$", re.IGNORECASE)
 NAME_IN_QUERY_RE = re.compile(r"name:([a-z0-9-]+)", re.IGNORECASE)
+# Runs of non-alphanumerics (dashes included) collapse to one dash in a single pass
+SLUG_INVALID_RE = re.compile(r"[^a-z0-9]+")
 
 sys.path.insert(0, str(PROJECT_DIR))
 from src.api import pokemon_tcg_api  # noqa: E402
@@ -143,8 +145,7 @@ def iter_target_files(paths: List[str], fallback_dir: Path) -> Iterable[Path]:
 
 
 def slugify(value: str) -> str:
-    slug = re.sub(r"[^a-z0-9-]+", "-", value.lower())
-    slug = re.sub(r"-+", "-", slug).strip("-")
+    slug = SLUG_INVALID_RE.sub("-", value.lower()).strip("-")
     return slug or value.lower()
 
 
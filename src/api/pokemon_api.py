@@ -2,9 +2,18 @@
 Pokemon lookup tools integration
 Provides functions to fetch Pokemon data from PokeAPI
 """
+import logging
 import requests
 from typing import Dict, Optional, List
 from src.utils.mock_pokemon_data import MOCK_POKEMON_DATA, MOCK_SPECIES_DATA, MOCK_POKEMON_LIST
+from src.utils.http_session import get_http_session
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Pokemon and species payloads are effectively immutable, so keep hot ones in memory
+POKEMON_CACHE_SIZE = 512
+POKEMON_CACHE_TTL = 24 * 60 * 60
 
 class PokemonTools:
     """Tools for looking up Pokemon information"""
@@ -12,6 +21,9 @@ class PokemonTools:
     def __init__(self):
         self.base_url = "https://pokeapi.co/api/v2"
         self.use_mock = False  # Will be set to True if API is unavailable
+        self.session = get_http_session()
+        self._pokemon_cache = TTLCache(maxsize=POKEMON_CACHE_SIZE, ttl=POKEMON_CACHE_TTL)
+        self._species_cache = TTLCache(maxsize=POKEMON_CACHE_SIZE, ttl=POKEMON_CACHE_TTL)
     
     def get_pokemon(self, name_or_id: str) -> Optional[Dict]:
         """
@@ -23,22 +35,30 @@ class PokemonTools:
         Returns:
             Dict containing Pokemon data or None if not found
         """
+        key = name_or_id.lower()
+        
         # Only use mock if explicitly enabled (API was unavailable)
         if self.use_mock:
-            mock_data = MOCK_POKEMON_DATA.get(name_or_id.lower())
+            mock_data = MOCK_POKEMON_DATA.get(key)
             if mock_data:
-                print(f"Using mock data for {name_or_id}")
+                logger.info("Using mock data for %s", name_or_id)
                 return mock_data
         
+        cached = self._pokemon_cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
-            url = f"{self.base_url}/pokemon/{name_or_id.lower()}"
-            response = requests.get(url, timeout=10)
+            url = f"{self.base_url}/pokemon/{key}"
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
-            return response.json()
+            data = response.json()
+            self._pokemon_cache.set(key, data)
+            return data
         except requests.RequestException as e:
-            print(f"Error fetching Pokemon from API: {e}, using mock data")
+            logger.warning("Error fetching Pokemon from API: %s, using mock data", e)
             # Only use mock as fallback
-            mock_data = MOCK_POKEMON_DATA.get(name_or_id.lower())
+            mock_data = MOCK_POKEMON_DATA.get(key)
             if mock_data:
                 return mock_data
             return None
@@ -53,21 +73,29 @@ class PokemonTools:
         Returns:
             Dict containing species data or None if not found
         """
+        key = name_or_id.lower()
+        
         # Only use mock if explicitly enabled
         if self.use_mock:
-            mock_data = MOCK_SPECIES_DATA.get(name_or_id.lower())
+            mock_data = MOCK_SPECIES_DATA.get(key)
             if mock_data:
                 return mock_data
         
+        cached = self._species_cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
-            url = f"{self.base_url}/pokemon-species/{name_or_id.lower()}"
-            response = requests.get(url, timeout=10)
+            url = f"{self.base_url}/pokemon-species/{key}"
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
-            return response.json()
+            data = response.json()
+            self._species_cache.set(key, data)
+            return data
         except requests.RequestException as e:
-            print(f"Error fetching Pokemon species from API: {e}, using mock data")
+            logger.warning("Error fetching Pokemon species from API: %s, using mock data", e)
             # Only use mock as fallback
-            mock_data = MOCK_SPECIES_DATA.get(name_or_id.lower())
+            mock_data = MOCK_SPECIES_DATA.get(key)
             if mock_data:
                 return mock_data
             return None
@@ -141,21 +169,21 @@ class PokemonTools:
         info = self.format_pokemon_info(pokemon_data, species_data)
         
         # Create a formatted response
-        response = f"**{info['name']}** (#{info['id']})\n\n"
+        parts = [f"**{info['name']}** (#{info['id']})\n\n"]
         
         if info.get('description'):
-            response += f"{info['description']}\n\n"
+            parts.append(f"{info['description']}\n\n")
         
-        response += f"**Type(s):** {', '.join(info['types']).title()}\n"
-        response += f"**Height:** {info['height']}m\n"
-        response += f"**Weight:** {info['weight']}kg\n"
-        response += f"**Abilities:** {', '.join(info['abilities']).title()}\n\n"
+        parts.append(f"**Type(s):** {', '.join(info['types']).title()}\n")
+        parts.append(f"**Height:** {info['height']}m\n")
+        parts.append(f"**Weight:** {info['weight']}kg\n")
+        parts.append(f"**Abilities:** {', '.join(info['abilities']).title()}\n\n")
         
-        response += "**Base Stats:**\n"
+        parts.append("**Base Stats:**\n")
         for stat_name, value in info['stats'].items():
-            response += f"- {stat_name.replace('-', ' ').title()}: {value}\n"
+            parts.append(f"- {stat_name.replace('-', ' ').title()}: {value}\n")
         
-        return response
+        return "".join(parts)
     
     def get_pokemon_list(self, limit: int = 20, offset: int = 0) -> List[Dict]:
         """
@@ -173,11 +201,11 @@ class PokemonTools:
         
         try:
             url = f"{self.base_url}/pokemon?limit={limit}&offset={offset}"
-            response = requests.get(url, timeout=5)
+            response = self.session.get(url, timeout=5)
             response.raise_for_status()
             data = response.json()
             return data.get("results", [])
         except requests.RequestException as e:
-            print(f"Error fetching Pokemon list from API: {e}, using mock data")
+            logger.warning("Error fetching Pokemon list from API: %s, using mock data", e)
             self.use_mock = True
             return MOCK_POKEMON_LIST[:limit]
@@ -3,12 +3,72 @@ Pokemon Trading Card Game lookup tools
 Provides functions to fetch Pokemon TCG card data from the Pokemon TCG API
 https://pokemontcg.io/
 """
+import logging
+import threading
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from typing import Dict, Optional, List
 import os
 
+from src.utils.http_session import POOL_SIZE
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Formatted cards shared by every client; popular cards show up in most searches
+FORMATTED_CARD_CACHE_SIZE = 4096
+_formatted_cards = TTLCache(maxsize=FORMATTED_CARD_CACHE_SIZE)
+
+# Per-request timeout for the TCG API, which can be slow
+POKEMON_TCG_TIMEOUT_SECONDS = float(os.getenv("POKEMON_TCG_TIMEOUT_SECONDS", "25"))
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _get_tcg_session() -> requests.Session:
+    """
+    Process-wide pooled session for the TCG API.
+    Shared by every client (including per-request API key ones) so calls reuse keep-alive connections;
+    the API key travels in each request's headers rather than on the session.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                retry_strategy = Retry(
+                    total=2,  # Reduced retries since each attempt takes 60s
+                    read=0,  # A read timeout already cost POKEMON_TCG_TIMEOUT_SECONDS; don't wait it out again
+                    backoff_factor=2,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                )
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry_strategy)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+# Top-level card fields copied as-is into the display format, with their defaults
+# ("set" and "images" are reshaped separately)
+_CARD_FIELDS = (
+    ("id", None),
+    ("name", "Unknown"),
+    ("supertype", None),  # Pokémon, Trainer, Energy
+    ("hp", None),
+    ("evolvesFrom", None),
+    ("convertedRetreatCost", 0),
+    ("number", None),
+    ("rarity", None),
+    ("flavorText", None),
+    ("artist", None),
+)
+# Fields that default to an empty list / dict; a fresh one per card, since formatted cards are shared
+_CARD_LIST_FIELDS = ("subtypes", "types", "evolvesTo", "abilities", "attacks", "weaknesses", "resistances", "retreatCost")
+_CARD_DICT_FIELDS = ("legalities", "tcgplayer", "cardmarket")
+
 
 class PokemonTCGTools:
     """Tools for looking up Pokemon Trading Card Game information"""
@@ -18,7 +78,8 @@ class PokemonTCGTools:
         self.headers = {
             "Content-Type": "application/json"
         }
-        self.timeout = 60  # Increased timeout to 60 seconds for slow API
+        # Kept under TOOL_CALL_TIMEOUT_SECONDS so a slow API can't outlive the chat tool call waiting on it
+        self.timeout = POKEMON_TCG_TIMEOUT_SECONDS
         
         # Optional: Add API key for higher rate limits (free at pokemontcg.io)
         resolved_key = str(api_key or os.environ.get("POKEMON_TCG_API_KEY", "")).strip()
@@ -26,16 +87,8 @@ class PokemonTCGTools:
             self.headers["X-Api-Key"] = resolved_key
         self.api_key = resolved_key
         
-        # Set up session with retry logic
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=2,  # Reduced retries since each attempt takes 60s
-            backoff_factor=2,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("https://", adapter)
-        self.session.mount("http://", adapter)
+        # Shared session with retry logic and a connection pool
+        self.session = _get_tcg_session()
     
     def search_cards(self, query: str, page: int = 1, page_size: int = 10) -> Optional[Dict]:
         """
@@ -63,7 +116,7 @@ class PokemonTCGTools:
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
-            print(f"Error searching TCG cards: {e}")
+            logger.warning("Error searching TCG cards: %s", e)
             return None
     
     def search_cards_advanced(self, 
@@ -138,7 +191,7 @@ class PokemonTCGTools:
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
-            print(f"Error in advanced TCG search: {e}")
+            logger.warning("Error in advanced TCG search: %s", e)
             return None
     
     def get_card(self, card_id: str) -> Optional[Dict]:
@@ -157,7 +210,7 @@ class PokemonTCGTools:
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
-            print(f"Error fetching TCG card: {e}")
+            logger.warning("Error fetching TCG card: %s", e)
             return None
     
     def get_card_price(self, card_id: str) -> Optional[Dict]:
@@ -224,7 +277,7 @@ class PokemonTCGTools:
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
-            print(f"Error fetching TCG sets: {e}")
+            logger.warning("Error fetching TCG sets: %s", e)
             return None
     
     def format_card_info(self, card: Dict) -> Dict:
@@ -240,41 +293,39 @@ class PokemonTCGTools:
         if not card:
             return {}
         
-        info = {
-            "id": card.get("id"),
-            "name": card.get("name", "Unknown"),
-            "supertype": card.get("supertype"),  # Pokémon, Trainer, Energy
-            "subtypes": card.get("subtypes", []),
-            "types": card.get("types", []),
-            "hp": card.get("hp"),
-            "evolvesFrom": card.get("evolvesFrom"),
-            "evolvesTo": card.get("evolvesTo", []),
-            "abilities": card.get("abilities", []),
-            "attacks": card.get("attacks", []),
-            "weaknesses": card.get("weaknesses", []),
-            "resistances": card.get("resistances", []),
-            "retreatCost": card.get("retreatCost", []),
-            "convertedRetreatCost": card.get("convertedRetreatCost", 0),
-            "set": {
-                "name": card.get("set", {}).get("name"),
-                "series": card.get("set", {}).get("series"),
-                "releaseDate": card.get("set", {}).get("releaseDate"),
-                "logo": card.get("set", {}).get("images", {}).get("logo"),
-                "symbol": card.get("set", {}).get("images", {}).get("symbol")
-            },
-            "number": card.get("number"),
-            "rarity": card.get("rarity"),
-            "flavorText": card.get("flavorText"),
-            "artist": card.get("artist"),
-            "legalities": card.get("legalities", {}),
-            "images": {
-                "small": card.get("images", {}).get("small"),
-                "large": card.get("images", {}).get("large")
-            },
-            "tcgplayer": card.get("tcgplayer", {}),
-            "cardmarket": card.get("cardmarket", {})
+        # Prices are the only part that changes, so their update stamps are part of the key
+        cache_key = (
+            card.get("id"),
+            (card.get("tcgplayer") or {}).get("updatedAt"),
+            (card.get("cardmarket") or {}).get("updatedAt"),
+        )
+        if cache_key[0]:
+            info = _formatted_cards.get(cache_key)
+            if info is not None:
+                return info
+        
+        info = {key: card.get(key, default) for key, default in _CARD_FIELDS}
+        for key in _CARD_LIST_FIELDS:
+            info[key] = card[key] if key in card else []
+        for key in _CARD_DICT_FIELDS:
+            info[key] = card[key] if key in card else {}
+        card_set = card.get("set", {})
+        set_images = card_set.get("images", {})
+        info["set"] = {
+            "name": card_set.get("name"),
+            "series": card_set.get("series"),
+            "releaseDate": card_set.get("releaseDate"),
+            "logo": set_images.get("logo"),
+            "symbol": set_images.get("symbol")
+        }
+        images = card.get("images", {})
+        info["images"] = {
+            "small": images.get("small"),
+            "large": images.get("large")
         }
         
+        if cache_key[0]:
+            _formatted_cards.set(cache_key, info)
         return info
     
     def format_cards_response(self, cards_data: Dict) -> List[Dict]:
@@ -310,30 +361,31 @@ class PokemonTCGTools:
         cards = self.format_cards_response(cards_data)
         total = cards_data.get("totalCount", 0)
         
-        response = f"**{pokemon_name.title()} Trading Cards** ({total} total cards found)\n\n"
+        # Collect pieces and join once instead of re-copying the string on every +=
+        parts = [f"**{pokemon_name.title()} Trading Cards** ({total} total cards found)\n\n"]
         
         for card in cards[:5]:
-            response += f"**{card['name']}**"
+            parts.append(f"**{card['name']}**")
             if card.get('set', {}).get('name'):
-                response += f" - {card['set']['name']}"
-            response += "\n"
+                parts.append(f" - {card['set']['name']}")
+            parts.append("\n")
             
             if card.get('types'):
-                response += f"Type: {', '.join(card['types'])} | "
+                parts.append(f"Type: {', '.join(card['types'])} | ")
             if card.get('hp'):
-                response += f"HP: {card['hp']} | "
+                parts.append(f"HP: {card['hp']} | ")
             if card.get('rarity'):
-                response += f"Rarity: {card['rarity']}"
-            response += "\n"
+                parts.append(f"Rarity: {card['rarity']}")
+            parts.append("\n")
             
             if card.get('legalities'):
                 legal_formats = [k.title() for k, v in card['legalities'].items() if v == 'Legal']
                 if legal_formats:
-                    response += f"Legal in: {', '.join(legal_formats)}\n"
+                    parts.append(f"Legal in: {', '.join(legal_formats)}\n")
             
-            response += "\n"
+            parts.append("\n")
         
         if total > 5:
-            response += f"_...and {total - 5} more cards_"
+            parts.append(f"_...and {total - 5} more cards_")
         
-        return response
+        return "".join(parts)
@@ -3,7 +3,10 @@ Cache Routes - Handle cache management endpoints
 """
 
 import logging
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, jsonify
+
+from src.services.cache_service import get_cache_service
+from src.utils.json_utils import json_body
 
 logger = logging.getLogger(__name__)
 
@@ -13,8 +16,6 @@ cache_bp = Blueprint('cache', __name__, url_prefix='/api/cache')
 @cache_bp.route('/config', methods=['GET'])
 def get_cache_config():
     """Get current cache configuration and stats"""
-    from src.services.cache_service import get_cache_service
-    
     cache_service = get_cache_service()
     config = cache_service.get_config()
     stats = cache_service.get_stats()
@@ -28,10 +29,8 @@ def get_cache_config():
 @cache_bp.route('/enable', methods=['POST'])
 def set_cache_enabled():
     """Enable or disable caching"""
-    from src.services.cache_service import get_cache_service
-    
     try:
-        data = request.get_json()
+        data = json_body()
         enabled = data.get('enabled')
         
         if enabled is None:
@@ -52,10 +51,8 @@ def set_cache_enabled():
 @cache_bp.route('/pokeapi', methods=['POST'])
 def set_pokeapi_cache_enabled():
     """Enable or disable caching for PokeAPI proxy requests only"""
-    from src.services.cache_service import get_cache_service
-
     try:
-        data = request.get_json() or {}
+        data = json_body()
         enabled = data.get('enabled')
 
         if enabled is None:
@@ -76,10 +73,8 @@ def set_pokeapi_cache_enabled():
 @cache_bp.route('/tcg', methods=['POST'])
 def set_tcg_cache_enabled():
     """Enable or disable caching for Pokemon TCG API requests"""
-    from src.services.cache_service import get_cache_service
-
     try:
-        data = request.get_json() or {}
+        data = json_body()
         enabled = data.get('enabled')
 
         if enabled is None:
@@ -100,10 +95,8 @@ def set_tcg_cache_enabled():
 @cache_bp.route('/expiry', methods=['POST'])
 def set_cache_expiry():
     """Set cache expiry time in days"""
-    from src.services.cache_service import get_cache_service
-    
     try:
-        data = request.get_json()
+        data = json_body()
         days = data.get('days')
         
         if days is None:
@@ -127,8 +120,6 @@ def set_cache_expiry():
 @cache_bp.route('/clear', methods=['POST'])
 def clear_cache():
     """Clear all cached data"""
-    from src.services.cache_service import get_cache_service
-    
     try:
         cache_service = get_cache_service()
         count = cache_service.clear()
@@ -145,10 +136,8 @@ def clear_cache():
 @cache_bp.route('/invalidate', methods=['POST'])
 def invalidate_cache():
     """Invalidate specific cache entry by tool name and parameters"""
-    from src.services.cache_service import get_cache_service
-    
     try:
-        data = request.get_json()
+        data = json_body()
         tool = data.get('tool')
         params = data.get('params', {})
         
@@ -2,24 +2,139 @@
 Chat Routes - Handle chat and messaging endpoints
 """
 
+import os
+import re
 import time
+import queue
 import logging
-from flask import Blueprint, request, jsonify, Response, g
-from typing import Optional
-import json
-
+import threading
+import contextvars
+from dataclasses import dataclass, field
+from flask import Blueprint, request, jsonify, Response, g, stream_with_context
+from typing import Any, Iterator, Optional
+import orjson
+
+from azure_openai_chat import get_azure_chat
+from src.services.conversation_store import get_conversation_store
+from src.tools.tool_handlers import execute_tool, TOOL_NAME_MAP
 from src.utils.api_settings import resolve_api_settings
+from src.utils.circuit_breaker import get_circuit_breaker
+from src.utils.json_utils import json_body
 
 logger = logging.getLogger(__name__)
 
 chat_bp = Blueprint('chat', __name__, url_prefix='/api')
 
-# Store conversation history (in-memory)
-conversations = {}
-card_contexts = {}
+# Reject oversized chat messages before they reach history or the model
+MAX_MESSAGE_LENGTH = int(os.getenv('MAX_MESSAGE_LENGTH', '4000'))
+# Entries returned by /api/history/<user_id> when no limit is given
+HISTORY_PAGE_SIZE = 50
+
+# Shown instead of calling Azure OpenAI while its circuit breaker is open
+AZURE_UNAVAILABLE_MESSAGE = "My AI brain is temporarily unavailable. Please try again in a few seconds."
+
+# Whole-message greetings/help/thanks are answered without a model round-trip
+_TRIVIAL_RE = re.compile(r"^\s*(hi|hello|hey|help|what can you do|thanks|thank you)[\s!.?]*$", re.IGNORECASE)
+_HELP_REPLY = (
+    "I can look up any Pokemon's stats, types and abilities, search Pokemon trading cards "
+    "and their prices, or surprise you with a random Pokemon from a region or type. "
+    "Try \"Tell me about Pikachu\" or \"Show me Charizard cards\"!"
+)
+_TRIVIAL_REPLIES = {
+    "hi": "Hi there! " + _HELP_REPLY,
+    "hello": "Hello! " + _HELP_REPLY,
+    "hey": "Hey! " + _HELP_REPLY,
+    "help": _HELP_REPLY,
+    "what can you do": _HELP_REPLY,
+    "thanks": "You're welcome! Ask me about another Pokemon anytime.",
+    "thank you": "You're welcome! Ask me about another Pokemon anytime.",
+}
+
+# Conversation history and card context (Redis when REDIS_URL is set, otherwise in-process)
+conversation_store = get_conversation_store()
+
+
+@dataclass(slots=True)
+class ChatResponse:
+    """Reply produced by generate_response; serialized directly by the JSON provider."""
+    message: str = ""
+    pokemon_data: Optional[Any] = None
+    tcg_data: Optional[Any] = None
+    timestamp: float = field(default_factory=time.time)
+
+
+def _append_message(user_id: str, entry: dict) -> None:
+    """Append a history entry; the store keeps only the most recent MAX_CONVERSATION_HISTORY entries."""
+    conversation_store.append(user_id, entry)
+
+
+def _remember_card_context(user_id: str, card_context: Optional[str]) -> None:
+    """Add card context as a system message if provided and changed"""
+    if not card_context:
+        return
+    normalized_context = card_context.strip()
+    if normalized_context and conversation_store.set_card_context(user_id, normalized_context):
+        _append_message(user_id, {
+            "role": "system",
+            "content": f"Card context: {normalized_context}",
+            "timestamp": time.time()
+        })
+
+
+def _record_reply(user_id: str, response_data: ChatResponse) -> None:
+    """Add the assistant's reply to history"""
+    _append_message(user_id, {
+        "role": "assistant",
+        "content": response_data.message,
+        "pokemon_data": response_data.pokemon_data,
+        "tcg_data": response_data.tcg_data,
+        "timestamp": response_data.timestamp
+    })
+
+
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+# SSE comment line: ignored by clients but keeps proxies from closing an idle stream
+_SSE_HEARTBEAT = b": ping\n\n"
+# Seconds without a chunk (e.g. while tools run) before another heartbeat is sent
+STREAM_HEARTBEAT_SECONDS = float(os.getenv('STREAM_HEARTBEAT_SECONDS', '15'))
+_STREAM_END = object()
+
+
+def _sse_event(payload: dict) -> bytes:
+    """Encode one Server-Sent Event straight to bytes so the WSGI server can write it as-is"""
+    return _SSE_PREFIX + orjson.dumps(payload) + _SSE_SUFFIX
+
+
+def _quick_reply(message: str) -> Optional[str]:
+    """Canned reply for greetings and help requests, or None if the model is needed"""
+    match = _TRIVIAL_RE.match(message)
+    return _TRIVIAL_REPLIES[match.group(1).lower()] if match else None
+
+
+def _forward_to(tool_name: str):
+    """Handler for one Azure OpenAI function that forwards its arguments to the unified dispatcher"""
+    def handler(**arguments) -> dict:
+        return execute_tool(tool_name, arguments)
+    return handler
+
+
+# Azure OpenAI function names -> handlers, built once instead of on every request
+_TOOL_HANDLERS = {
+    name: _forward_to(TOOL_NAME_MAP.get(name, name))
+    for name in (
+        "get_pokemon_info",
+        "search_pokemon_cards",
+        "get_pokemon_list",
+        "get_random_pokemon",
+        "get_random_pokemon_from_region",
+        "get_random_pokemon_by_type",
+        "get_card_price",
+    )
+}
 
 
-def generate_response(message: str, user_id: str = "default", card_context: Optional[str] = None, context_only: bool = False, api_config: Optional[dict] = None) -> dict:
+def generate_response(message: str, user_id: str = "default", card_context: Optional[str] = None, context_only: bool = False, api_config: Optional[dict] = None) -> ChatResponse:
     """
     Generate a response to the user message using Azure OpenAI
     
@@ -30,119 +145,175 @@ def generate_response(message: str, user_id: str = "default", card_context: Opti
         context_only: If True, only update context without generating response
         
     Returns:
-        Dict containing response data
+        ChatResponse with the reply and any Pokemon/TCG data
     """
-    from azure_openai_chat import get_azure_chat
-    from src.tools.tool_handlers import execute_tool
-    
-    # Initialize conversation history if needed
-    if user_id not in conversations:
-        conversations[user_id] = []
-    # Initialize card context tracking
-    if user_id not in card_contexts:
-        card_contexts[user_id] = None
-
-    # Add card context as a system message if provided and changed
-    if card_context:
-        normalized_context = card_context.strip()
-        if normalized_context and card_contexts.get(user_id) != normalized_context:
-            conversations[user_id].append({
-                "role": "system",
-                "content": f"Card context: {normalized_context}",
-                "timestamp": time.time()
-            })
-            card_contexts[user_id] = normalized_context
+    _remember_card_context(user_id, card_context)
 
     if context_only:
-        return {
-            "message": "",
-            "pokemon_data": None,
-            "tcg_data": None,
-            "timestamp": time.time()
-        }
+        return ChatResponse()
 
     if not api_config:
         raise ValueError('API credentials are required to generate a response.')
 
+    quick_reply = _quick_reply(message)
+    if quick_reply is None:
+        # Skip the call entirely while this endpoint keeps failing
+        breaker = get_circuit_breaker(api_config.get('endpoint', ''))
+        if not breaker.allow():
+            return ChatResponse(message=AZURE_UNAVAILABLE_MESSAGE)
+
     # Add user message to history
-    conversations[user_id].append({
+    _append_message(user_id, {
         "role": "user",
         "content": message,
         "timestamp": time.time()
     })
     
-    response_data = {
-        "message": "",
-        "pokemon_data": None,
-        "tcg_data": None,
-        "timestamp": time.time()
-    }
+    if quick_reply is not None:
+        logger.info("Answered trivial message without Azure OpenAI")
+        response_data = ChatResponse(message=quick_reply)
+        _record_reply(user_id, response_data)
+        return response_data
+    
+    response_data = ChatResponse()
+    failed = False
     
     # Check if Azure OpenAI is configured
     try:
         azure_chat = get_azure_chat()
 
-        # Create wrapper functions that call the unified handlers
-        def handle_get_pokemon_info(pokemon_name: str) -> dict:
-            return execute_tool('get_pokemon', {'pokemon_name': pokemon_name})
-
-        def handle_search_pokemon_cards(
-            pokemon_name: str = None,
-            card_type: str = None,
-            hp_min: int = None,
-            hp_max: int = None,
-            rarity: str = None
-        ) -> dict:
-            return execute_tool('search_pokemon_cards', {
-                'pokemon_name': pokemon_name,
-                'card_type': card_type,
-                'hp_min': hp_min,
-                'hp_max': hp_max,
-                'rarity': rarity
-            })
+        # Call Azure OpenAI with tools
+        result = azure_chat.chat(message, user_id, _TOOL_HANDLERS, client_config=api_config)
 
-        def handle_get_pokemon_list(limit: int = 10, offset: int = 0) -> dict:
-            return execute_tool('get_pokemon_list', {'limit': limit, 'offset': offset})
+        response_data.message = result["message"]
+        response_data.pokemon_data = result.get("pokemon_data")
+        response_data.tcg_data = result.get("tcg_data")
+        failed = result.get("error") is not None
 
-        def handle_get_random_pokemon() -> dict:
-            return execute_tool('get_random_pokemon', {})
+    except Exception as e:
+        logger.error(f"Azure OpenAI error: {e}")
+        response_data.message = f"I'm having trouble connecting to my AI brain. Error: {str(e)}"
+        failed = True
+    
+    # Error text is returned to the user but kept out of history so it never reaches later prompts
+    if failed:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+        _record_reply(user_id, response_data)
+    
+    return response_data
 
-        def handle_get_random_pokemon_from_region(region: str) -> dict:
-            return execute_tool('get_random_pokemon_from_region', {'region': region})
 
-        def handle_get_random_pokemon_by_type(pokemon_type: str) -> dict:
-            return execute_tool('get_random_pokemon_by_type', {'pokemon_type': pokemon_type})
+def stream_response(message: str, user_id: str, card_context: Optional[str], api_config: dict) -> Iterator[dict]:
+    """
+    Streaming counterpart of generate_response
+    
+    Yields:
+        {"text": str, "done": False} chunks as Azure OpenAI produces them, then a final
+        {"text": "", "done": True, "pokemon_data": ..., "tcg_data": ...} chunk
+    """
+    _remember_card_context(user_id, card_context)
 
-        tool_handlers = {
-            "get_pokemon_info": handle_get_pokemon_info,
-            "search_pokemon_cards": handle_search_pokemon_cards,
-            "get_pokemon_list": handle_get_pokemon_list,
-            "get_random_pokemon": handle_get_random_pokemon,
-            "get_random_pokemon_from_region": handle_get_random_pokemon_from_region,
-            "get_random_pokemon_by_type": handle_get_random_pokemon_by_type
-        }
+    quick_reply = _quick_reply(message)
+    if quick_reply is None:
+        breaker = get_circuit_breaker(api_config.get('endpoint', ''))
+        if not breaker.allow():
+            yield {"text": AZURE_UNAVAILABLE_MESSAGE, "done": False}
+            yield {"text": "", "done": True, "pokemon_data": None, "tcg_data": None}
+            return
 
-        # Call Azure OpenAI with tools
-        result = azure_chat.chat(message, user_id, tool_handlers, client_config=api_config)
+    _append_message(user_id, {
+        "role": "user",
+        "content": message,
+        "timestamp": time.time()
+    })
+    response_data = ChatResponse()
+
+    if quick_reply is not None:
+        logger.info("Answered trivial message without Azure OpenAI")
+        response_data.message = quick_reply
+        _record_reply(user_id, response_data)
+        yield {"text": quick_reply, "done": False}
+        yield {"text": "", "done": True, "pokemon_data": None, "tcg_data": None}
+        return
+    failed = False
+
+    # Forward text as Azure OpenAI produces it; tool data arrives with the final event
+    try:
+        azure_chat = get_azure_chat()
+        for event in azure_chat.chat_stream(message, user_id, _TOOL_HANDLERS, client_config=api_config):
+            if event["type"] == "delta":
+                yield {"text": event["text"], "done": False}
+            else:
+                response_data.message = event["message"]
+                response_data.pokemon_data = event.get("pokemon_data")
+                response_data.tcg_data = event.get("tcg_data")
+                failed = event.get("error") is not None
+    except Exception as e:
+        logger.error(f"Azure OpenAI error: {e}")
+        response_data.message = f"I'm having trouble connecting to my AI brain. Error: {str(e)}"
+        failed = True
+        yield {"text": response_data.message, "done": False}
+
+    if failed:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+        _record_reply(user_id, response_data)
+
+    yield {
+        "text": "",
+        "done": True,
+        "pokemon_data": response_data.pokemon_data,
+        "tcg_data": response_data.tcg_data
+    }
 
-        response_data["message"] = result["message"]
-        response_data["pokemon_data"] = result.get("pokemon_data")
-        response_data["tcg_data"] = result.get("tcg_data")
 
+def _produce_chunks(chunks: queue.SimpleQueue, *args) -> None:
+    """Run stream_response on a worker thread, handing each chunk to the SSE writer"""
+    try:
+        for chunk in stream_response(*args):
+            chunks.put(chunk)
     except Exception as e:
-        logger.error(f"Azure OpenAI error: {e}")
-        response_data["message"] = f"I'm having trouble connecting to my AI brain. Error: {str(e)}"
-    
-    # Add response to history
-    conversations[user_id].append({
-        "role": "assistant",
-        "content": response_data["message"],
-        "pokemon_data": response_data.get("pokemon_data"),
-        "tcg_data": response_data.get("tcg_data"),
-        "timestamp": response_data["timestamp"]
-    })
-    
-    return response_data
+        logger.exception("Chat stream failed")
+        # Close the turn so the client stops waiting on a reply that will never finish
+        chunks.put({
+            "text": f"Sorry, something went wrong while answering. Error: {str(e)}",
+            "done": True,
+            "pokemon_data": None,
+            "tcg_data": None,
+            "error": str(e)
+        })
+    finally:
+        chunks.put(_STREAM_END)
+
+
+def _sse_stream(message: str, user_id: str, card_context: Optional[str], api_config: dict) -> Iterator[bytes]:
+    """
+    Encode stream_response as SSE, starting with a heartbeat so the client gets its
+    first bytes immediately and repeating it while the model or tools are still working
+    """
+    chunks: queue.SimpleQueue = queue.SimpleQueue()
+    # The copied context carries the request context (g.api_settings) into the producer thread
+    context = contextvars.copy_context()
+    threading.Thread(
+        target=context.run,
+        args=(_produce_chunks, chunks, message, user_id, card_context, api_config),
+        name="chat-stream",
+        daemon=True
+    ).start()
+
+    yield _SSE_HEARTBEAT
+    while True:
+        try:
+            chunk = chunks.get(timeout=STREAM_HEARTBEAT_SECONDS)
+        except queue.Empty:
+            yield _SSE_HEARTBEAT
+            continue
+        if chunk is _STREAM_END:
+            return
+        yield _sse_event(chunk)
 
 
 @chat_bp.route('/chat', methods=['POST'])
@@ -154,7 +325,7 @@ def chat():
     Returns JSON: {"message": "response", "pokemon_data": {...}, "timestamp": float}
     """
     try:
-        data = request.get_json()
+        data = json_body()
         message = data.get('message', '')
         user_id = data.get('user_id', 'default')
         card_context = data.get('card_context')
@@ -162,6 +333,8 @@ def chat():
         
         if not message:
             return jsonify({"error": "Message is required"}), 400
+        if len(message) > MAX_MESSAGE_LENGTH:
+            return jsonify({"error": f"Message exceeds {MAX_MESSAGE_LENGTH} characters"}), 413
 
         try:
             api_settings = resolve_api_settings(api_settings_payload, require_chat=True)
@@ -182,10 +355,12 @@ def chat_stream():
     Handle streaming chat responses (Server-Sent Events)
     
     Expects JSON: {"message": "user message", "user_id": "optional_user_id"}
-    Returns: Server-Sent Events stream
+    Returns: Server-Sent Events stream of {"text": "...", "done": false} chunks as the model
+             generates them, then {"text": "", "done": true, "pokemon_data": ..., "tcg_data": ...}.
+             ": ping" comment lines are sent first and whenever the stream is otherwise idle.
     """
     try:
-        data = request.get_json()
+        data = json_body()
         message = data.get('message', '')
         user_id = data.get('user_id', 'default')
         card_context = data.get('card_context')
@@ -193,28 +368,22 @@ def chat_stream():
         
         if not message:
             return jsonify({"error": "Message is required"}), 400
+        if len(message) > MAX_MESSAGE_LENGTH:
+            return jsonify({"error": f"Message exceeds {MAX_MESSAGE_LENGTH} characters"}), 413
 
         try:
             api_settings = resolve_api_settings(api_settings_payload, require_chat=True)
         except ValueError as exc:
             return jsonify({"error": str(exc)}), 400
         g.api_settings = api_settings
+        events = _sse_stream(message, user_id, card_context, api_settings['chat'])
         
-        def generate():
-            response_data = generate_response(message, user_id, card_context, api_config=api_settings['chat'])
-            
-            # Stream the response word by word for a typing effect
-            words = response_data["message"].split()
-            for i, word in enumerate(words):
-                chunk = {
-                    "word": word,
-                    "done": i == len(words) - 1,
-                    "pokemon_data": response_data["pokemon_data"] if i == len(words) - 1 else None
-                }
-                yield f"data: {json.dumps(chunk)}\n\n"
-                time.sleep(0.05)  # Simulate typing delay
-        
-        return Response(generate(), mimetype='text/event-stream')
+        # Keep the request context (and g.api_settings for TCG tools) alive while streaming
+        response = Response(stream_with_context(events), mimetype='text/event-stream', direct_passthrough=True)
+        # Ask reverse proxies (nginx / App Service front ends) not to hold back events
+        response.headers['X-Accel-Buffering'] = 'no'
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -227,19 +396,55 @@ def get_history(user_id):
     
     Args:
         user_id: User identifier
+    
+    Query params:
+        limit: Only return the newest N entries (default HISTORY_PAGE_SIZE)
+        before: Only return entries with a timestamp up to this (for paging back)
+        before_skip: Leave out this many of the newest entries stamped exactly `before`
         
     Returns:
-        JSON with conversation history
+        JSON {"history": [...], "next_before": ts or null, "next_before_skip": int}, streamed
+        entry by entry. Pass next_before and next_before_skip as `before` and `before_skip`
+        to fetch the previous page; the skip count keeps entries that share a timestamp
+        across a page boundary from being dropped.
     """
-    history = conversations.get(user_id, [])
-    return jsonify({"history": history})
+    limit = request.args.get('limit', HISTORY_PAGE_SIZE, type=int)
+    before = request.args.get('before', type=float)
+    before_skip = request.args.get('before_skip', 0, type=int)
+    if limit <= 0:
+        return jsonify({"error": "limit must be a positive integer"}), 400
+    if before_skip < 0:
+        return jsonify({"error": "before_skip must not be negative"}), 400
+
+    # One extra entry tells us whether an older page exists
+    history = conversation_store.history(user_id, limit=limit + 1, before=before, before_skip=before_skip)
+    next_before = None
+    next_before_skip = 0
+    if len(history) > limit:
+        history = history[1:]
+        next_before = history[0].get("timestamp", 0)
+        # Everything already returned at that timestamp: this page's oldest run plus earlier skips
+        for entry in history:
+            if entry.get("timestamp", 0) != next_before:
+                break
+            next_before_skip += 1
+        if next_before == before:
+            next_before_skip += before_skip
+
+    def generate():
+        yield b'{"history":['
+        for index, entry in enumerate(history):
+            yield (b',' if index else b'') + orjson.dumps(entry, option=orjson.OPT_NON_STR_KEYS)
+        yield b'],"next_before":' + orjson.dumps(next_before) + b',"next_before_skip":' + orjson.dumps(next_before_skip) + b'}'
+
+    return Response(generate(), mimetype='application/json')
 
 
 @chat_bp.route('/chat/record', methods=['POST'])
 def record_chat_entry():
     """Store arbitrary chat entries (used by quick actions sharing tool results)."""
     try:
-        data = request.get_json() or {}
+        data = json_body()
         user_id = data.get('user_id', 'default')
         user_message = data.get('user_message')
         assistant_text = data.get('assistant_text')
@@ -251,14 +456,14 @@ def record_chat_entry():
             generate_response('', user_id, card_context, context_only=True)
 
         if user_message:
-            conversations.setdefault(user_id, []).append({
+            _append_message(user_id, {
                 "role": "user",
                 "content": user_message,
                 "timestamp": time.time()
             })
 
         if assistant_text:
-            conversations.setdefault(user_id, []).append({
+            _append_message(user_id, {
                 "role": "assistant",
                 "content": assistant_text,
                 "pokemon_data": pokemon_data,
@@ -275,7 +480,6 @@ def record_chat_entry():
 def random_pokemon_tool():
     """Return a random Pokemon result via the shared tool handlers."""
     try:
-        from src.tools.tool_handlers import execute_tool
         result = execute_tool('get_random_pokemon', {})
         return jsonify({"result": result})
     except Exception as e:
@@ -9,13 +9,23 @@ import re
 from datetime import datetime
 from pathlib import Path
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, jsonify, request
+
+from src.tools.tool_manager import tool_manager
+from src.utils.json_utils import json_body
 
 logger = logging.getLogger(__name__)
 
 face_bp = Blueprint('face', __name__, url_prefix='/api/face')
 
 PROFILES_DIR = Path('profiles_pic')
+_PROFILE_NAME_INVALID_RE = re.compile(r'[^A-Za-z0-9_-]+')
+
+
+def _get_face_service():
+    """Import the face service on first use; face_recognition/dlib are heavy and only needed when enabled"""
+    from src.services.face_recognition_service import get_face_recognition_service
+    return get_face_recognition_service()
 
 
 @face_bp.route('/identify', methods=['POST'])
@@ -23,7 +33,8 @@ def identify_face():
     """
     Identify a user from a captured image using face recognition.
     
-    Expects JSON: {"image": "base64_encoded_image"}
+    Expects JSON: {"image": "base64_encoded_image"}, or the base64 image / data URI
+    itself as a text/plain body (passed on as bytes, skipping JSON parsing)
     Returns JSON: {
         "name": "person_name" or None,
         "confidence": float,
@@ -32,8 +43,6 @@ def identify_face():
         "error": str (optional)
     }
     """
-    from src.tools.tool_manager import tool_manager
-    
     try:
         # Check if face identification tool is enabled
         if not tool_manager.is_tool_enabled("face_identification"):
@@ -41,16 +50,14 @@ def identify_face():
                 "error": "Face identification is disabled. Enable it in the tools settings."
             }), 403
 
-        data = request.get_json()
-        if not data or 'image' not in data:
+        if request.mimetype == 'text/plain':
+            base64_image = request.get_data(cache=False)
+        else:
+            base64_image = json_body().get('image')
+        if not base64_image:
             return jsonify({"error": "Image data is required"}), 400
 
-        base64_image = data['image']
-
-        # Import face recognition service
-        from src.services.face_recognition_service import get_face_recognition_service
-
-        face_service = get_face_recognition_service()
+        face_service = _get_face_service()
         result = face_service.identify_face_from_base64(base64_image)
 
         if result is None:
@@ -66,22 +73,20 @@ def identify_face():
 @face_bp.route('/profiles', methods=['POST'])
 def save_face_profile():
     """Save a captured face photo into the profiles directory."""
-    from src.tools.tool_manager import tool_manager
-
     try:
         if not tool_manager.is_tool_enabled("face_identification"):
             return jsonify({
                 "error": "Face identification is disabled. Enable it in the tools settings."
             }), 403
 
-        data = request.get_json() or {}
+        data = json_body()
         base64_image = data.get('image')
         raw_name = data.get('name', '').strip()
 
         if not base64_image or not raw_name:
             return jsonify({"error": "Image data and profile name are required."}), 400
 
-        sanitized_name = re.sub(r'[^A-Za-z0-9_-]+', '-', raw_name).strip('-_').lower()
+        sanitized_name = _PROFILE_NAME_INVALID_RE.sub('-', raw_name).strip('-_').lower()
         if not sanitized_name:
             return jsonify({"error": "Profile name must include letters or numbers."}), 400
 
@@ -105,9 +110,7 @@ def save_face_profile():
         with output_path.open('wb') as f:
             f.write(image_bytes)
 
-        from src.services.face_recognition_service import get_face_recognition_service
-
-        face_service = get_face_recognition_service()
+        face_service = _get_face_service()
         face_service.reload_profiles()
 
         return jsonify({
@@ -131,8 +134,6 @@ def get_face_recognition_status():
     
     Returns JSON with loaded profiles and current configuration.
     """
-    from src.tools.tool_manager import tool_manager
-    
     try:
         if not tool_manager.is_tool_enabled("face_identification"):
             return jsonify({
@@ -140,9 +141,7 @@ def get_face_recognition_status():
                 "message": "Face identification is disabled"
             })
 
-        from src.services.face_recognition_service import get_face_recognition_service
-
-        face_service = get_face_recognition_service()
+        face_service = _get_face_service()
         status = face_service.get_status()
         status['enabled'] = True
 
@@ -161,17 +160,13 @@ def reload_face_profiles():
     
     Returns JSON with reload status.
     """
-    from src.tools.tool_manager import tool_manager
-    
     try:
         if not tool_manager.is_tool_enabled("face_identification"):
             return jsonify({
                 "error": "Face identification is disabled"
             }), 403
 
-        from src.services.face_recognition_service import get_face_recognition_service
-
-        face_service = get_face_recognition_service()
+        face_service = _get_face_service()
         face_service.reload_profiles()
         status = face_service.get_status()
 
@@ -193,17 +188,13 @@ def reset_current_user():
     
     Returns JSON with reset status.
     """
-    from src.tools.tool_manager import tool_manager
-    
     try:
         if not tool_manager.is_tool_enabled("face_identification"):
             return jsonify({
                 "error": "Face identification is disabled"
             }), 403
 
-        from src.services.face_recognition_service import get_face_recognition_service
-
-        face_service = get_face_recognition_service()
+        face_service = _get_face_service()
         face_service.reset_current_user()
 
         return jsonify({
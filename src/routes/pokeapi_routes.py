@@ -10,6 +10,7 @@ import requests
 from flask import Blueprint, jsonify, request
 
 from src.services.cache_service import get_cache_service
+from src.utils.http_session import get_http_session
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,9 @@ POKEAPI_BASE_URL = os.environ.get("POKEMON_API_URL", "https://pokeapi.co/api/v2"
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 POKEMON_LIST_PATH = PROJECT_ROOT / "data" / "pokemon_list.json"
 cache_service = get_cache_service()
+# Browsers reuse successful responses this long, then revalidate them with the ETag; kept short
+# so the cache toggle and invalidate endpoints take effect within minutes
+POKEAPI_BROWSER_MAX_AGE = 5 * 60
 
 pokeapi_bp = Blueprint("pokeapi", __name__, url_prefix="/api/pokemon")
 
@@ -31,7 +35,7 @@ def _load_static_pokemon_list():
 def get_pokemon_list():
     """Return the static pokemon index for grid rendering."""
     try:
-        return jsonify(_load_static_pokemon_list())
+        return _browser_cacheable(jsonify(_load_static_pokemon_list()))
     except FileNotFoundError:
         logger.error("Pokemon list file missing at %s", POKEMON_LIST_PATH)
         return jsonify({"error": "Pokemon list unavailable"}), 500
@@ -40,6 +44,14 @@ def get_pokemon_list():
         return jsonify({"error": "Pokemon list invalid"}), 500
 
 
+def _browser_cacheable(response):
+    """Let this browser (not shared proxies) reuse the response briefly, answering revalidations with 304"""
+    response.cache_control.private = True
+    response.cache_control.max_age = POKEAPI_BROWSER_MAX_AGE
+    response.add_etag()
+    return response.make_conditional(request)
+
+
 def _should_refresh() -> bool:
     """Check if the client requested a cache refresh."""
     value = request.args.get("refresh")
@@ -74,7 +86,7 @@ def _fetch_with_cache(
 
     url = f"{POKEAPI_BASE_URL.rstrip('/')}/{resource_path.lstrip('/')}"
     try:
-        resp = requests.get(url, timeout=15)
+        resp = get_http_session().get(url, timeout=15)
     except requests.RequestException as exc:
         logger.error("Error contacting PokeAPI for %s: %s", resource_path, exc)
         raise
@@ -115,6 +127,9 @@ def _proxy_resource(cache_key: str, params: Dict[str, str], resource_path: str):
 
     response = jsonify(data)
     response.headers["X-PokeAPI-Cache"] = cache_status
+    # With the cache disabled or a refresh requested, every request should reach PokeAPI
+    if use_cache and not refresh:
+        response = _browser_cacheable(response)
     logger.info(
         "PokeAPI proxy %s cache=%s status=%s",
         resource_path,
@@ -3,9 +3,12 @@ Realtime Routes - Handle Azure OpenAI Realtime Voice API endpoints
 """
 
 import logging
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, jsonify
 
+from realtime_chat import get_realtime_config, get_session_config, check_realtime_availability, get_available_tools
+from src.tools.tool_handlers import execute_tool, TOOL_NAME_MAP
 from src.utils.api_settings import resolve_api_settings
+from src.utils.json_utils import json_body
 
 logger = logging.getLogger(__name__)
 
@@ -21,10 +24,8 @@ def get_realtime_connection_config():
     Returns:
         JSON with WebSocket URL and session configuration
     """
-    from realtime_chat import get_realtime_config, get_session_config, check_realtime_availability, get_available_tools
-    
     try:
-        data = request.get_json() or {}
+        data = json_body()
         api_settings_payload = data.get('api_settings')
         preferred_voice = data.get('voice')
         preferred_language = data.get('language') or data.get('language_preference')
@@ -76,9 +77,7 @@ def get_realtime_status():
     Returns:
         JSON with availability status
     """
-    from realtime_chat import check_realtime_availability
-    
-    data = request.get_json(silent=True) or {}
+    data = json_body()
     api_settings_payload = data.get('api_settings')
     realtime_config = None
     if api_settings_payload:
@@ -109,44 +108,33 @@ def execute_realtime_tool():
     Returns:
         JSON with tool execution result
     """
-    from src.tools.tool_handlers import execute_tool
-    
     try:
-        data = request.get_json()
+        data = json_body()
         tool_name = data.get('tool_name')
         arguments = data.get('arguments', {})
         
-        print(f"\n{'='*60}")
-        print(f"🔧 REALTIME TOOL CALL")
-        print(f"{'='*60}")
-        print(f"📌 Tool: {tool_name}")
-        print(f"📋 Arguments: {arguments}")
+        logger.debug("🔧 Realtime tool call: tool=%s args=%s", tool_name, arguments)
         
         if not tool_name:
-            print(f"❌ Error: tool_name is required")
+            logger.warning("Realtime tool call rejected: tool_name is required")
             return jsonify({"error": "tool_name is required"}), 400
         
         # Map realtime tool names to standard names if needed
-        tool_name_map = {
-            'get_pokemon_info': 'get_pokemon',
-        }
-        standard_tool_name = tool_name_map.get(tool_name, tool_name)
+        standard_tool_name = TOOL_NAME_MAP.get(tool_name, tool_name)
         
         # Use the unified tool handler
         result = execute_tool(standard_tool_name, arguments)
         
-        # Log the result
+        # Log the result (preview is only built when debug logging is on)
         if "error" in result:
-            print(f"❌ Result: ERROR - {result.get('error')}")
-        else:
-            result_preview = str(result)[:200] + "..." if len(str(result)) > 200 else str(result)
-            print(f"✅ Result: SUCCESS")
-            print(f"📦 Preview: {result_preview}")
-        print(f"{'='*60}\n")
+            logger.warning("Realtime tool %s failed: %s", tool_name, result.get('error'))
+        elif logger.isEnabledFor(logging.DEBUG):
+            result_text = str(result)
+            result_preview = result_text[:200] + "..." if len(result_text) > 200 else result_text
+            logger.debug("✅ Realtime tool %s succeeded: %s", tool_name, result_preview)
         
         return jsonify({"result": result})
         
     except Exception as e:
-        print(f"💥 EXCEPTION: {str(e)}")
-        print(f"{'='*60}\n")
+        logger.exception("Realtime tool call failed: %s", e)
         return jsonify({"error": str(e)}), 500
@@ -2,13 +2,22 @@
 Tool Routes - Handle tool management endpoints
 """
 
+import hashlib
 import logging
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, jsonify, request
+
+import orjson
+
+from src.tools.tool_manager import tool_manager
+from src.utils.json_utils import json_body
 
 logger = logging.getLogger(__name__)
 
 tool_bp = Blueprint('tool', __name__, url_prefix='/api/tools')
 
+# (tool_manager.version, JSON body, ETag) for GET /api/tools
+_tools_payload = (None, b'', '')
+
 
 @tool_bp.route('', methods=['GET'])
 def get_tools():
@@ -18,12 +27,29 @@ def get_tools():
     Returns:
         JSON with list of all tools
     """
-    from src.tools.tool_manager import tool_manager
-    
-    return jsonify({
-        "tools": tool_manager.get_all_tools(),
-        "categories": tool_manager.get_categories()
-    })
+    body, etag = _get_tools_payload()
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _get_tools_payload():
+    """Serialized tool list and its ETag, rebuilt only when the tool states change"""
+    global _tools_payload
+    version, body, etag = _tools_payload
+    if version != tool_manager.version:
+        body = orjson.dumps({
+            "tools": tool_manager.get_all_tools(),
+            "categories": tool_manager.get_categories()
+        })
+        # Hash the content rather than the version; each worker process counts versions on its own
+        etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+        _tools_payload = (tool_manager.version, body, etag)
+    return body, etag
 
 
 @tool_bp.route('/<tool_id>', methods=['GET'])
@@ -37,8 +63,6 @@ def get_tool(tool_id):
     Returns:
         JSON with tool data
     """
-    from src.tools.tool_manager import tool_manager
-    
     tool = tool_manager.get_tool(tool_id)
     if not tool:
         return jsonify({"error": f"Tool '{tool_id}' not found"}), 404
@@ -57,10 +81,8 @@ def update_tool(tool_id):
     Returns:
         JSON with updated tool data
     """
-    from src.tools.tool_manager import tool_manager
-    
     try:
-        data = request.get_json()
+        data = json_body()
         enabled = data.get('enabled')
         
         if enabled is None:
@@ -86,10 +108,8 @@ def update_tools():
     Returns:
         JSON with results
     """
-    from src.tools.tool_manager import tool_manager
-    
     try:
-        data = request.get_json()
+        data = json_body()
         tool_states = data.get('tool_states', {})
         
         if not tool_states:
@@ -108,8 +128,6 @@ def update_tools():
 @tool_bp.route('/reset', methods=['POST'])
 def reset_tools():
     """Reset all tools to their default states"""
-    from src.tools.tool_manager import tool_manager
-    
     tool_manager.reset_to_defaults()
     return jsonify({
         "message": "Tools reset to defaults",
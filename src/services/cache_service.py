@@ -7,11 +7,29 @@ import time
 import hashlib
 import logging
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Any, Tuple
 
+from src.utils.ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
+# Hot entries are also kept in memory so repeat lookups skip the file read and JSON parse.
+# The short TTL bounds how long a worker can serve an entry another worker deleted.
+MEMORY_CACHE_SIZE = 1024
+MEMORY_CACHE_TTL = 3600
+
+# Any run of characters outside [a-z0-9] collapses to a single dash, so one
+# pass is enough to produce a slug without repeated separators.
+_SLUG_INVALID_RE = re.compile(r"[^a-z0-9]+")
+
+
+@lru_cache(maxsize=4096)
+def _slugify_cached(value: str) -> str:
+    """Memoized slug; the same few Pokemon names and filter values are slugged on every cache get/set"""
+    return _SLUG_INVALID_RE.sub("-", value.lower()).strip('-')
+
 
 class CacheService:
     """Manages caching of API responses with expiration"""
@@ -31,6 +49,8 @@ class CacheService:
         # Config file for cache settings
         self.config_file = self.cache_dir / "cache_config.json"
         self.config = self._load_config()
+        # cache_key -> (cached_at, response)
+        self._memory = TTLCache(maxsize=MEMORY_CACHE_SIZE, ttl=MEMORY_CACHE_TTL)
         self._pokeapi_cache_keys = {
             "get_pokemon",
             "pokeapi_pokemon",
@@ -169,6 +189,17 @@ class CacheService:
             params = {}
         
         cache_key = self._get_cache_key(endpoint, params)
+        expiry_days = self.config.get("expiry_days", 7)
+        expiry_seconds = None if expiry_days <= 0 else expiry_days * 24 * 60 * 60
+
+        memory_entry = self._memory.get(cache_key)
+        if memory_entry is not None:
+            cached_time, response = memory_entry
+            if expiry_seconds is None or time.time() - cached_time <= expiry_seconds:
+                logger.debug(f"Memory cache hit for {endpoint}")
+                return response
+            self._memory.delete(cache_key)
+
         cache_path = self._get_cache_path(endpoint, params, cache_key)
         candidate_paths = [cache_path]
         legacy_path = self.cache_dir / f"{cache_key}.json"
@@ -185,8 +216,6 @@ class CacheService:
             
             # Check if expired
             cached_time = cached_data.get("cached_at", 0)
-            expiry_days = self.config.get("expiry_days", 7)
-            expiry_seconds = None if expiry_days <= 0 else expiry_days * 24 * 60 * 60
 
             if expiry_seconds is not None and time.time() - cached_time > expiry_seconds:
                 logger.info(f"Cache expired for {endpoint}")
@@ -194,7 +223,9 @@ class CacheService:
                 return None
             
             logger.info(f"Cache hit for {endpoint}")
-            return cached_data.get("response")
+            response = cached_data.get("response")
+            self._memory.set(cache_key, (cached_time, response))
+            return response
         
         except Exception as e:
             logger.error(f"Error reading cache: {e}")
@@ -226,6 +257,7 @@ class CacheService:
                 "response": response,
                 "cached_at": time.time()
             }
+            self._memory.set(cache_key, (cached_data["cached_at"], response))
             
             with cache_path.open('w', encoding='utf-8') as f:
                 json.dump(cached_data, f, indent=2, ensure_ascii=False)
@@ -250,6 +282,7 @@ class CacheService:
             Number of files deleted
         """
         count = 0
+        self._memory.clear()
         try:
             for cache_file in self.cache_dir.glob("*.json"):
                 if cache_file.name != "cache_config.json":
@@ -276,6 +309,7 @@ class CacheService:
             params = {}
         
         cache_key = self._get_cache_key(endpoint, params)
+        self._memory.delete(cache_key)
         cache_path = self._get_cache_path(endpoint, params, cache_key)
         legacy_path = self.cache_dir / f"{cache_key}.json"
         for path in (cache_path, legacy_path):
@@ -332,9 +366,7 @@ class CacheService:
     def _slugify(self, value: str) -> str:
         if not value:
             return ""
-        slug = re.sub(r"[^a-z0-9]+", "-", value.lower())
-        slug = re.sub(r"-+", "-", slug).strip('-')
-        return slug
+        return _slugify_cached(value)
 
     def _resolve_pokemon_identity(self, params: Dict[str, Any], keys: Optional[Tuple[str, ...]] = None) -> Tuple[Optional[int], Optional[str]]:
         if not params:
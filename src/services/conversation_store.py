@@ -0,0 +1,300 @@
+"""
+Conversation Store
+Keeps per-user chat history and the last scanned card context, plus the
+compact transcript replayed to Azure OpenAI as model context.
+
+Uses Redis when REDIS_URL is set so every gunicorn worker (and every replica)
+sees the same history; otherwise falls back to a bounded in-process store.
+When CONVERSATION_ARCHIVE_DIR is set, entries that age out of either store are
+appended to a gzip-compressed JSON-lines file per user instead of being dropped.
+"""
+import os
+import gzip
+import hashlib
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Dict, Iterable, List, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+MAX_CONVERSATION_USERS = int(os.getenv('MAX_CONVERSATION_USERS', '500'))
+MAX_CONVERSATION_HISTORY = int(os.getenv('MAX_CONVERSATION_HISTORY', '200'))
+CONVERSATION_TTL_SECONDS = int(os.getenv('CONVERSATION_TTL_SECONDS', '86400'))
+# Only the most recent entries keep their raw pokemon_data/tcg_data; older ones keep just the text
+HISTORY_PAYLOAD_MESSAGES = int(os.getenv('HISTORY_PAYLOAD_MESSAGES', '3'))
+
+# User/assistant turns replayed to the model on each request (system prompt not included)
+MODEL_CONTEXT_MESSAGES = int(os.getenv('MODEL_CONTEXT_MESSAGES', '20'))
+# Optional directory for entries that fall out of the bounded history
+CONVERSATION_ARCHIVE_DIR = os.getenv('CONVERSATION_ARCHIVE_DIR')
+
+_PAYLOAD_KEYS = ('pokemon_data', 'tcg_data')
+
+
+def _strip_payloads(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return a copy of entry without tool payloads, or None if it carries none"""
+    if not any(entry.get(key) is not None for key in _PAYLOAD_KEYS):
+        return None
+    return {key: value for key, value in entry.items() if key not in _PAYLOAD_KEYS}
+
+
+def _page_before(newest_first: Iterable[Dict[str, Any]], limit: Optional[int], before: Optional[float],
+                 before_skip: int = 0) -> List[Dict[str, Any]]:
+    """
+    Collect up to `limit` entries older than the (before, before_skip) cursor, oldest first.
+    Entries stamped exactly `before` are kept too, except the newest `before_skip` of them,
+    which the previous page already returned. No `before` means start from the newest entry.
+    """
+    page = []
+    for entry in newest_first:
+        timestamp = entry.get("timestamp", 0)
+        if before is not None and timestamp > before:
+            continue
+        if before is not None and timestamp == before and before_skip > 0:
+            before_skip -= 1
+            continue
+        page.append(entry)
+        if limit is not None and len(page) >= limit:
+            break
+    page.reverse()
+    return page
+
+
+class ConversationArchive:
+    """Appends aged-out history entries to <directory>/<hash of user_id>.jsonl.gz"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, user_id: str) -> str:
+        # Hash the id so arbitrary user ids are always safe file names
+        name = hashlib.blake2b(user_id.encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.directory, f"{name}.jsonl.gz")
+
+    def append(self, user_id: str, entries: List[Any]) -> None:
+        """Append entries (dicts or already-serialized JSON bytes); each call adds one gzip member"""
+        if not entries:
+            return
+        lines = b"".join(
+            (entry if isinstance(entry, bytes) else orjson.dumps(entry)) + b"\n" for entry in entries
+        )
+        try:
+            with self._lock, gzip.open(self._path(user_id), 'ab') as archive:
+                archive.write(lines)
+        except OSError as e:
+            logger.warning(f"Could not archive conversation history: {e}")
+
+
+class InMemoryConversationStore:
+    """Per-process store; least recently active users are evicted first"""
+
+    def __init__(self, max_users: int = MAX_CONVERSATION_USERS, max_history: int = MAX_CONVERSATION_HISTORY,
+                 archive: Optional[ConversationArchive] = None):
+        self.max_users = max_users
+        self.max_history = max_history
+        self.archive = archive
+        self._conversations: "OrderedDict[str, deque]" = OrderedDict()
+        self._card_contexts: Dict[str, str] = {}
+        self._lock = threading.RLock()
+
+    def _get_conversation(self, user_id: str) -> deque:
+        """Get or create the bounded history deque for a user and mark it as recently used"""
+        history = self._conversations.get(user_id)
+        if history is None:
+            history = self._conversations[user_id] = deque(maxlen=self.max_history)
+            while len(self._conversations) > self.max_users:
+                evicted_user, _ = self._conversations.popitem(last=False)
+                self._card_contexts.pop(evicted_user, None)
+        else:
+            self._conversations.move_to_end(user_id)
+        return history
+
+    def append(self, user_id: str, entry: Dict[str, Any]) -> None:
+        """Append a history entry; the oldest is dropped once max_history is reached
+        and entries older than HISTORY_PAYLOAD_MESSAGES lose their tool payloads"""
+        evicted = None
+        with self._lock:
+            history = self._get_conversation(user_id)
+            if self.archive is not None and len(history) == self.max_history:
+                evicted = history[0]
+            history.append(entry)
+            # Each append pushes exactly one entry past the payload window
+            if len(history) > HISTORY_PAYLOAD_MESSAGES:
+                index = -HISTORY_PAYLOAD_MESSAGES - 1
+                stripped = _strip_payloads(history[index])
+                if stripped is not None:
+                    history[index] = stripped
+        # Archive outside the store lock so file I/O never blocks other users
+        if evicted is not None:
+            self.archive.append(user_id, [evicted])
+
+    def history(self, user_id: str, limit: Optional[int] = None, before: Optional[float] = None,
+                before_skip: int = 0) -> List[Dict[str, Any]]:
+        """
+        Return a copy of the user's history, oldest first
+
+        Args:
+            limit: Only return the newest `limit` entries
+            before: Only return entries with a timestamp up to this
+            before_skip: Leave out this many of the newest entries stamped exactly `before`
+        """
+        with self._lock:
+            history = self._conversations.get(user_id)
+            if not history:
+                return []
+            if before is None and limit is None:
+                return list(history)
+            # Walk back from the newest entry so only the requested page is copied
+            return _page_before(reversed(history), limit, before, before_skip)
+
+    def set_card_context(self, user_id: str, card_context: str) -> bool:
+        """Store the card context. Returns True if it differs from the previous one"""
+        with self._lock:
+            if self._card_contexts.get(user_id) == card_context:
+                return False
+            self._card_contexts[user_id] = card_context
+            return True
+
+
+class RedisConversationStore:
+    """Shared store backed by a Redis list per user (conv:<user_id>) and a card key (card:<user_id>)"""
+
+    def __init__(self, url: str, max_history: int = MAX_CONVERSATION_HISTORY, ttl: int = CONVERSATION_TTL_SECONDS,
+                 archive: Optional[ConversationArchive] = None):
+        import redis
+
+        self.max_history = max_history
+        self.ttl = ttl
+        self.archive = archive
+        self._client = redis.Redis.from_url(url, max_connections=50)
+
+    def append(self, user_id: str, entry: Dict[str, Any]) -> None:
+        key = f"conv:{user_id}"
+        if HISTORY_PAYLOAD_MESSAGES <= 0:
+            # No payload window: the new entry itself is stored without payloads
+            entry = _strip_payloads(entry) or entry
+        serialized = orjson.dumps(entry)
+
+        def push(pipe) -> List[bytes]:
+            # Read under WATCH (indexes are before the push): the entries the trim will drop and
+            # the one that ages out of the payload window. A concurrent append to the same key
+            # aborts EXEC and redis-py retries, so the stripped copy always lands on the right entry.
+            trimmed = pipe.lrange(key, 0, -self.max_history) if self.archive is not None else []
+            aged = pipe.lindex(key, -HISTORY_PAYLOAD_MESSAGES) if HISTORY_PAYLOAD_MESSAGES > 0 else None
+            stripped = _strip_payloads(orjson.loads(aged)) if aged else None
+            pipe.multi()
+            pipe.rpush(key, serialized)
+            if stripped is not None:
+                pipe.lset(key, -HISTORY_PAYLOAD_MESSAGES - 1, orjson.dumps(stripped))
+            pipe.ltrim(key, -self.max_history, -1)
+            pipe.expire(key, self.ttl)
+            return trimmed
+
+        trimmed = self._client.transaction(push, key, value_from_callable=True)
+        if trimmed:
+            self.archive.append(user_id, trimmed)
+
+    def history(self, user_id: str, limit: Optional[int] = None, before: Optional[float] = None,
+                before_skip: int = 0) -> List[Dict[str, Any]]:
+        key = f"conv:{user_id}"
+        if before is None:
+            start = -limit if limit else 0
+            return [orjson.loads(item) for item in self._client.lrange(key, start, -1)]
+        return _page_before(map(orjson.loads, reversed(self._client.lrange(key, 0, -1))), limit, before, before_skip)
+
+    def set_card_context(self, user_id: str, card_context: str) -> bool:
+        key = f"card:{user_id}"
+        pipe = self._client.pipeline(transaction=False)
+        pipe.getset(key, card_context)
+        pipe.expire(key, self.ttl)
+        previous, _ = pipe.execute()
+        return previous is None or previous.decode('utf-8') != card_context
+
+
+class InMemoryContextStore:
+    """
+    Per-process model context: the last MODEL_CONTEXT_MESSAGES {role, content} turns per user.
+    Tool call/result messages only live for the turn that produced them.
+    """
+
+    def __init__(self, max_users: int = MAX_CONVERSATION_USERS, max_messages: int = MODEL_CONTEXT_MESSAGES):
+        self.max_users = max_users
+        self.max_messages = max_messages
+        self._contexts: "OrderedDict[str, deque]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def append(self, user_id: str, role: str, content: str) -> None:
+        with self._lock:
+            messages = self._contexts.get(user_id)
+            if messages is None:
+                messages = self._contexts[user_id] = deque(maxlen=self.max_messages)
+                while len(self._contexts) > self.max_users:
+                    self._contexts.popitem(last=False)
+            else:
+                self._contexts.move_to_end(user_id)
+            messages.append({"role": role, "content": content})
+
+    def messages(self, user_id: str) -> List[Dict[str, str]]:
+        with self._lock:
+            return list(self._contexts.get(user_id, ()))
+
+    def clear(self, user_id: str) -> None:
+        with self._lock:
+            self._contexts.pop(user_id, None)
+
+
+class RedisContextStore:
+    """Shared model context in a capped Redis list per user (ctx:<user_id>)"""
+
+    def __init__(self, url: str, max_messages: int = MODEL_CONTEXT_MESSAGES, ttl: int = CONVERSATION_TTL_SECONDS):
+        import redis
+
+        self.max_messages = max_messages
+        self.ttl = ttl
+        self._client = redis.Redis.from_url(url, max_connections=50)
+
+    def append(self, user_id: str, role: str, content: str) -> None:
+        key = f"ctx:{user_id}"
+        pipe = self._client.pipeline(transaction=False)
+        pipe.rpush(key, orjson.dumps({"role": role, "content": content}))
+        pipe.ltrim(key, -self.max_messages, -1)
+        pipe.expire(key, self.ttl)
+        pipe.execute()
+
+    def messages(self, user_id: str) -> List[Dict[str, str]]:
+        return [orjson.loads(item) for item in self._client.lrange(f"ctx:{user_id}", 0, -1)]
+
+    def clear(self, user_id: str) -> None:
+        self._client.delete(f"ctx:{user_id}")
+
+
+_conversation_store = None
+_context_store = None
+
+
+def get_conversation_store():
+    """Get or create the global conversation store"""
+    global _conversation_store
+    if _conversation_store is None:
+        redis_url = os.getenv('REDIS_URL')
+        archive = ConversationArchive(CONVERSATION_ARCHIVE_DIR) if CONVERSATION_ARCHIVE_DIR else None
+        if redis_url:
+            logger.info("Using Redis conversation store")
+            _conversation_store = RedisConversationStore(redis_url, archive=archive)
+        else:
+            _conversation_store = InMemoryConversationStore(archive=archive)
+    return _conversation_store
+
+
+def get_context_store():
+    """Get or create the global model context store (Redis when REDIS_URL is set)"""
+    global _context_store
+    if _context_store is None:
+        redis_url = os.getenv('REDIS_URL')
+        _context_store = RedisContextStore(redis_url) if redis_url else InMemoryContextStore()
+    return _context_store
@@ -3,17 +3,63 @@ Face Recognition Service for Real-Time User Identification
 Handles face detection, encoding, and identification using face_recognition library
 """
 import os
+import time
 import logging
+import cv2
 import face_recognition
 import numpy as np
 from pathlib import Path
-from typing import Optional, Dict, List, Tuple
+from typing import Optional, Dict, List, Tuple, Union
 from PIL import Image
 import io
-import base64
+import binascii
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.ttl_cache import TTLCache
+
+try:
+    import faiss
+except ImportError:  # Optional; NumPy handles typical profile counts
+    faiss = None
 
 logger = logging.getLogger(__name__)
 
+# Profile picture file types loaded from the profiles directory
+SUPPORTED_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp'})
+
+# Encodings of unchanged profile pictures are reused from this file instead of re-running HOG at startup
+ENCODING_CACHE_FILENAME = ".encodings.npz"
+
+# Frames larger than this are decoded at a reduced scale, never going below it on the longest side
+DECODE_MIN_SIDE = 640
+_REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+# JPEG start-of-frame markers (baseline, progressive, lossless, ...); they carry the frame size
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# Frames whose longest side exceeds this are scaled down to it before HOG detection (a 640x480
+# webcam frame becomes 480x360); encodings are still computed from the decoded frame
+DETECTION_MAX_SIDE = 480
+
+# A probe this close to the last identified user is accepted without scanning the other profiles
+EARLY_ACCEPT_DISTANCE = 0.4
+
+# A single face whose box overlaps the last match this much within this window keeps that identity
+# without being encoded again
+STICKY_IDENTITY_SECONDS = 0.5
+STICKY_MIN_IOU = 0.5
+
+# With faiss installed, profile sets at least this large are searched with a faiss flat index
+FAISS_MIN_PROFILES = 1000
+
+# Identical webcam frames within this window reuse the previous match
+MATCH_CACHE_SIZE = 512
+MATCH_CACHE_TTL = 300
+
 
 class FaceRecognitionService:
     """
@@ -29,6 +75,7 @@ class FaceRecognitionService:
             profiles_dir: Directory containing profile pictures (default: profiles_pic)
         """
         self.profiles_dir = Path(profiles_dir)
+        self._encoding_cache_path = self.profiles_dir / ENCODING_CACHE_FILENAME
         self.known_face_encodings: List[np.ndarray] = []
         self.known_face_names: List[str] = []
         self.last_identified_user: Optional[str] = None
@@ -37,6 +84,15 @@ class FaceRecognitionService:
         self.tolerance = 0.6  # Lower is more strict (0.6 is default)
         self.model = "hog"  # "hog" is faster, "cnn" is more accurate but requires GPU
 
+        # Recent frame hash -> match, and the known encodings stacked for vectorized comparison
+        self._match_cache = TTLCache(maxsize=MATCH_CACHE_SIZE, ttl=MATCH_CACHE_TTL)
+        self._known_encoding_matrix = np.empty((0, 128), dtype=np.float32)
+        self._known_squared_norms = np.empty(0, dtype=np.float32)
+        self._rows_by_name: Dict[str, np.ndarray] = {}
+        self._faiss_index = None
+        # (monotonic time, face box, name, distance) of the last successful match
+        self._sticky_match: Optional[Tuple[float, Tuple[int, int, int, int], str, float]] = None
+
         # Load known faces from profiles directory
         self._load_known_faces()
 
@@ -50,46 +106,139 @@ class FaceRecognitionService:
             self.profiles_dir.mkdir(parents=True, exist_ok=True)
             return
 
-        supported_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp'}
-        loaded_count = 0
+        image_paths = [path for path in self.profiles_dir.iterdir() if path.suffix.lower() in SUPPORTED_EXTENSIONS]
+        mtimes = {path: path.stat().st_mtime_ns for path in image_paths}
+
+        # Only pictures that are new or changed since the cache was written need encoding
+        cached = self._read_encoding_cache()
+        stale = [path for path in image_paths if cached.get(path.name, (None,))[0] != mtimes[path]]
+
+        encoded = {}
+        if stale:
+            # Decoding and HOG/encoding release the GIL, so profiles load in parallel
+            workers = max(1, min(len(stale), os.cpu_count() or 1))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                encoded = dict(zip(stale, executor.map(self._load_profile_encoding, stale)))
+
+        names = []
+        encodings = []
+        cache_entries = {}
+        for path in image_paths:
+            if path in encoded:
+                if encoded[path] is None:
+                    continue
+                encoding = encoded[path][1]
+            else:
+                encoding = cached[path.name][1]
+            names.append(path.stem)
+            encodings.append(encoding)
+            cache_entries[path.name] = (mtimes[path], encoding)
 
-        for image_path in self.profiles_dir.iterdir():
-            if image_path.suffix.lower() not in supported_extensions:
-                continue
+        if encoded or cache_entries.keys() != cached.keys():
+            self._write_encoding_cache(cache_entries)
 
-            try:
-                # Load image
-                image = face_recognition.load_image_file(str(image_path))
+        self.known_face_names = names
+        self.known_face_encodings = encodings
 
-                # Get face encodings
-                face_encodings = face_recognition.face_encodings(image, model=self.model)
+        self._rebuild_encoding_matrix()
+        logger.info(
+            f"Loaded {len(names)} face encodings from {self.profiles_dir} "
+            f"({len(names) - sum(entry is not None for entry in encoded.values())} from cache)"
+        )
 
-                if len(face_encodings) == 0:
-                    logger.warning(f"No face detected in {image_path.name}")
-                    continue
+    def _read_encoding_cache(self) -> Dict[str, Tuple[int, np.ndarray]]:
+        """Load filename -> (mtime_ns, encoding) from the encodings cache; empty if missing or unreadable"""
+        try:
+            with np.load(self._encoding_cache_path) as data:
+                return {
+                    filename: (mtime, encoding)
+                    for filename, mtime, encoding in zip(data["files"].tolist(), data["mtimes"].tolist(), data["encodings"])
+                }
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable face encoding cache {self._encoding_cache_path}: {e}")
+            return {}
 
-                if len(face_encodings) > 1:
-                    logger.warning(f"Multiple faces detected in {image_path.name}, using the first one")
+    def _write_encoding_cache(self, entries: Dict[str, Tuple[int, np.ndarray]]):
+        """Save the encodings cache; written to a temp file and swapped in so workers never read a partial file"""
+        tmp_path = self._encoding_cache_path.with_name(f"{ENCODING_CACHE_FILENAME}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    files=np.array(list(entries), dtype=str),
+                    mtimes=np.array([mtime for mtime, _ in entries.values()], dtype=np.int64),
+                    encodings=np.array([encoding for _, encoding in entries.values()]).reshape(-1, 128),
+                )
+            os.replace(tmp_path, self._encoding_cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write face encoding cache {self._encoding_cache_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def _load_profile_encoding(self, image_path: Path) -> Optional[Tuple[str, np.ndarray]]:
+        """Encode the face in one profile picture. Returns (name, encoding) or None"""
+        try:
+            # Load image
+            image = face_recognition.load_image_file(str(image_path))
 
-                # Store encoding and name (filename without extension)
-                self.known_face_encodings.append(face_encodings[0])
-                person_name = image_path.stem  # Filename without extension
-                self.known_face_names.append(person_name)
-                loaded_count += 1
+            # Get face encodings
+            face_encodings = face_recognition.face_encodings(image, model=self.model)
 
-                logger.info(f"Loaded face encoding for: {person_name}")
+            if len(face_encodings) == 0:
+                logger.warning(f"No face detected in {image_path.name}")
+                return None
 
-            except Exception as e:
-                logger.error(f"Error loading {image_path.name}: {e}")
+            if len(face_encodings) > 1:
+                logger.warning(f"Multiple faces detected in {image_path.name}, using the first one")
 
-        logger.info(f"Loaded {loaded_count} face encodings from {self.profiles_dir}")
+            # Name is the filename without extension
+            person_name = image_path.stem
+            logger.info(f"Loaded face encoding for: {person_name}")
+            return person_name, face_encodings[0]
+
+        except Exception as e:
+            logger.error(f"Error loading {image_path.name}: {e}")
+            return None
 
-    def identify_face_from_base64(self, base64_image: str) -> Optional[Dict[str, any]]:
+    def _rebuild_encoding_matrix(self):
+        """
+        Stack known encodings into one contiguous float32 (profiles, 128) array so a probe is
+        compared in a single pass; float32 halves memory traffic and is far below the tolerance's precision
+        """
+        if self.known_face_encodings:
+            self._known_encoding_matrix = np.ascontiguousarray(np.vstack(self.known_face_encodings), dtype=np.float32)
+        else:
+            self._known_encoding_matrix = np.empty((0, 128), dtype=np.float32)
+        self._sticky_match = None
+        self._known_squared_norms = np.einsum('ij,ij->i', self._known_encoding_matrix, self._known_encoding_matrix)
+        rows_by_name: Dict[str, List[int]] = {}
+        for row, name in enumerate(self.known_face_names):
+            rows_by_name.setdefault(name, []).append(row)
+        self._rows_by_name = {name: np.array(rows) for name, rows in rows_by_name.items()}
+
+        self._faiss_index = None
+        if faiss is not None and len(self._known_encoding_matrix) >= FAISS_MIN_PROFILES:
+            self._faiss_index = faiss.IndexFlatL2(self._known_encoding_matrix.shape[1])
+            self._faiss_index.add(self._known_encoding_matrix)
+        self._match_cache.clear()
+
+    @staticmethod
+    def _no_match_result(error: str) -> Dict[str, any]:
+        return {
+            "name": None,
+            "confidence": 0.0,
+            "is_new_user": False,
+            "greeting_message": None,
+            "error": error
+        }
+
+    def identify_face_from_base64(self, base64_image: Union[str, bytes]) -> Optional[Dict[str, any]]:
         """
         Identify a person from a base64-encoded image
         
         Args:
-            base64_image: Base64-encoded image string (with or without data URI prefix)
+            base64_image: Base64-encoded image as str or bytes (with or without data URI prefix)
         
         Returns:
             Dict with identification result:
@@ -100,24 +249,85 @@ class FaceRecognitionService:
                 "greeting_message": str or None
             }
         """
-        try:
-            # Remove data URI prefix if present
-            if ',' in base64_image:
-                base64_image = base64_image.split(',')[1]
+        if len(self.known_face_encodings) == 0:
+            return self.identify_face_from_array(None)
 
-            # Decode base64 to bytes
-            image_bytes = base64.b64decode(base64_image)
+        # Webcam polling often re-sends identical frames; reuse the match for those
+        payload = base64_image.encode('ascii', 'ignore') if isinstance(base64_image, str) else base64_image
+        frame_key = hashlib.blake2b(payload, digest_size=16).digest()
+        match = self._match_cache.get(frame_key)
+        if match is not None:
+            return self._build_identification(*match)
 
-            # Convert to PIL Image then to numpy array
-            pil_image = Image.open(io.BytesIO(image_bytes))
-            image_array = np.array(pil_image)
+        try:
+            # Skip the data URI prefix if present and decode base64 to bytes in one C call
+            image_bytes = binascii.a2b_base64(memoryview(payload)[payload.rfind(b',') + 1:])
 
-            return self.identify_face_from_array(image_array)
+            image_array = self._decode_image(image_bytes)
 
         except Exception as e:
             logger.error(f"Error identifying face from base64: {e}")
             return None
 
+        try:
+            match = self._match_face(image_array)
+        except Exception as e:
+            logger.error(f"Error during face identification: {e}")
+            return self._no_match_result(f"Error during identification: {str(e)}")
+
+        self._match_cache.set(frame_key, match)
+        return self._build_identification(*match)
+
+    @staticmethod
+    def _decode_image(image_bytes: bytes) -> np.ndarray:
+        """
+        Decode an encoded frame to an RGB array; OpenCV's libjpeg-turbo path first, PIL for formats it lacks (GIF).
+        Large JPEGs are decoded at 1/2, 1/4 or 1/8 scale (libjpeg's scaled IDCT) while keeping
+        the longest side at least DECODE_MIN_SIDE.
+        """
+        flag = cv2.IMREAD_COLOR
+        size = FaceRecognitionService._jpeg_size(image_bytes)
+        if size is not None:
+            longest = max(size)
+            for factor, reduced_flag in _REDUCED_DECODE_FLAGS:
+                if longest // factor >= DECODE_MIN_SIDE:
+                    flag = reduced_flag
+                    break
+
+        bgr = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), flag)
+        if bgr is not None:
+            return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+
+        try:
+            image = Image.open(io.BytesIO(image_bytes))
+            return np.asarray(image.convert('RGB'), dtype=np.uint8)
+        except Exception as e:
+            raise ValueError("Unsupported or corrupt image data") from e
+
+    @staticmethod
+    def _jpeg_size(image_bytes: bytes) -> Optional[Tuple[int, int]]:
+        """Read (width, height) from a JPEG's start-of-frame segment without decoding; None for other formats"""
+        if image_bytes[:2] != b'\xff\xd8':
+            return None
+        pos = 2
+        while pos + 4 <= len(image_bytes):
+            if image_bytes[pos] != 0xFF:
+                return None
+            marker = image_bytes[pos + 1]
+            if marker == 0xFF:  # Fill byte before a marker
+                pos += 1
+                continue
+            if marker == 0xDA:  # Start of scan; no frame header before it
+                return None
+            if marker in _JPEG_SOF_MARKERS:
+                if pos + 9 > len(image_bytes):
+                    return None
+                height = int.from_bytes(image_bytes[pos + 5:pos + 7], 'big')
+                width = int.from_bytes(image_bytes[pos + 7:pos + 9], 'big')
+                return width, height
+            pos += 2 + int.from_bytes(image_bytes[pos + 2:pos + 4], 'big')
+        return None
+
     def identify_face_from_array(self, image_array: np.ndarray) -> Optional[Dict[str, any]]:
         """
         Identify a person from a numpy array image
@@ -130,107 +340,129 @@ class FaceRecognitionService:
         """
         if len(self.known_face_encodings) == 0:
             logger.warning("No known faces loaded. Cannot identify anyone.")
-            return {
-                "name": None,
-                "confidence": 0.0,
-                "is_new_user": False,
-                "greeting_message": None,
-                "error": "No profile pictures loaded. Please add photos to profiles_pic directory."
-            }
+            return self._no_match_result("No profile pictures loaded. Please add photos to profiles_pic directory.")
 
         try:
-            # Detect faces in the captured image
-            face_locations = face_recognition.face_locations(image_array, model=self.model)
-
-            if len(face_locations) == 0:
-                logger.info("No face detected in the image")
-                return {
-                    "name": None,
-                    "confidence": 0.0,
-                    "is_new_user": False,
-                    "greeting_message": None,
-                    "error": "No face detected in the image"
-                }
-
-            if len(face_locations) > 1:
-                logger.warning(f"Multiple faces detected ({len(face_locations)}), using the first one")
-
-            # Get face encodings for detected faces
-            face_encodings = face_recognition.face_encodings(
-                image_array, 
-                known_face_locations=face_locations,
-                model=self.model
-            )
-
-            if len(face_encodings) == 0:
-                return {
-                    "name": None,
-                    "confidence": 0.0,
-                    "is_new_user": False,
-                    "greeting_message": None,
-                    "error": "Could not encode detected face"
-                }
+            return self._build_identification(*self._match_face(image_array))
+        except Exception as e:
+            logger.error(f"Error during face identification: {e}")
+            return self._no_match_result(f"Error during identification: {str(e)}")
 
-            # Use the first detected face
-            captured_encoding = face_encodings[0]
+    def _match_face(self, image_array: np.ndarray) -> Tuple[Optional[str], float, Optional[str]]:
+        """
+        Find the closest known face in an image
 
-            # Compare against known faces
-            face_distances = face_recognition.face_distance(
-                self.known_face_encodings, 
-                captured_encoding
-            )
+        Returns:
+            (name, distance, error) - name is None when nothing within tolerance was found
+        """
+        # Detect faces in the captured image (on a downscaled copy, since HOG cost grows with pixel count)
+        face_locations = self._detect_faces(image_array)
+
+        if len(face_locations) == 0:
+            logger.info("No face detected in the image")
+            return None, 0.0, "No face detected in the image"
+
+        if len(face_locations) > 1:
+            logger.warning(f"Multiple faces detected ({len(face_locations)}), using the first one")
+        else:
+            # Same face in about the same place moments after a match: skip encoding and the search
+            sticky = self._sticky_match
+            if (sticky is not None and time.monotonic() - sticky[0] < STICKY_IDENTITY_SECONDS
+                    and _box_iou(face_locations[0], sticky[1]) >= STICKY_MIN_IOU):
+                return sticky[2], sticky[3], None
+
+        # Get face encodings for detected faces
+        face_encodings = face_recognition.face_encodings(
+            image_array, 
+            known_face_locations=face_locations,
+            model=self.model
+        )
+
+        if len(face_encodings) == 0:
+            return None, 0.0, "Could not encode detected face"
+
+        # Compare the first detected face against every known face at once:
+        # |k - p|^2 = |k|^2 - 2 k.p + |p|^2, so one matrix-vector product and no (profiles, 128) temporary
+        probe = face_encodings[0].astype(np.float32)
+        probe_squared_norm = probe @ probe
+
+        # The person in front of the camera is usually the one seen last; a clear match ends the search
+        last_rows = self._rows_by_name.get(self.last_identified_user)
+        if last_rows is not None:
+            squared = self._known_squared_norms[last_rows] - 2.0 * (self._known_encoding_matrix[last_rows] @ probe) + probe_squared_norm
+            last_distance = float(np.sqrt(max(float(squared.min()), 0.0)))
+            if last_distance <= EARLY_ACCEPT_DISTANCE:
+                self._sticky_match = (time.monotonic(), face_locations[0], self.last_identified_user, last_distance)
+                return self.last_identified_user, last_distance, None
+
+        if self._faiss_index is not None:
+            squared_distances, indices = self._faiss_index.search(probe.reshape(1, -1), 1)
+            best_match_index = int(indices[0, 0])
+            best_distance = float(np.sqrt(max(float(squared_distances[0, 0]), 0.0)))
+        else:
+            squared = self._known_squared_norms - 2.0 * (self._known_encoding_matrix @ probe) + probe_squared_norm
+            face_distances = np.sqrt(np.maximum(squared, 0.0))
 
             # Find the best match
-            best_match_index = np.argmin(face_distances)
-            best_distance = face_distances[best_match_index]
-
-            # Check if the match is within tolerance
-            if best_distance <= self.tolerance:
-                identified_name = self.known_face_names[best_match_index]
-                confidence = 1.0 - best_distance  # Convert distance to confidence score
-
-                # Check if this is a new user (different from last identified)
-                is_new_user = (self.last_identified_user != identified_name)
-
-                # Generate greeting message only for new users
-                greeting_message = None
-                if is_new_user:
-                    greeting_message = f"Hello, {identified_name}! Nice to see you."
-                    self.last_identified_user = identified_name
-                    logger.info(f"New user identified: {identified_name} (confidence: {confidence:.2f})")
-                else:
-                    logger.info(f"Same user detected: {identified_name} (confidence: {confidence:.2f})")
-
-                return {
-                    "name": identified_name,
-                    "confidence": float(confidence),
-                    "is_new_user": is_new_user,
-                    "greeting_message": greeting_message
-                }
-            else:
-                # No match found within tolerance
-                logger.info(f"No match found (best distance: {best_distance:.2f})")
-                return {
-                    "name": None,
-                    "confidence": 0.0,
-                    "is_new_user": False,
-                    "greeting_message": None,
-                    "error": "Face detected but not recognized. Please add your photo to profiles_pic."
-                }
+            best_match_index = int(np.argmin(face_distances))
+            best_distance = float(face_distances[best_match_index])
+
+        # Check if the match is within tolerance
+        if best_distance <= self.tolerance:
+            name = self.known_face_names[best_match_index]
+            self._sticky_match = (time.monotonic(), face_locations[0], name, best_distance)
+            return name, best_distance, None
+
+        # No match found within tolerance
+        logger.info(f"No match found (best distance: {best_distance:.2f})")
+        return None, best_distance, "Face detected but not recognized. Please add your photo to profiles_pic."
+
+    def _detect_faces(self, image_array: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """Run face detection on a downscaled copy and map the boxes back to the coordinates of image_array"""
+        height, width = image_array.shape[:2]
+        longest = max(height, width)
+        if longest <= DETECTION_MAX_SIDE:
+            return face_recognition.face_locations(image_array, model=self.model)
+
+        scale = longest / DETECTION_MAX_SIDE
+        small = cv2.resize(
+            image_array, (round(width / scale), round(height / scale)), interpolation=cv2.INTER_AREA
+        )
+        return [
+            (round(top * scale), min(round(right * scale), width), min(round(bottom * scale), height), round(left * scale))
+            for top, right, bottom, left in face_recognition.face_locations(small, model=self.model)
+        ]
+
+    def _build_identification(self, identified_name: Optional[str], distance: float, error: Optional[str]) -> Dict[str, any]:
+        """Turn a match into the API result, greeting users who differ from the last one seen"""
+        if identified_name is None:
+            return self._no_match_result(error)
+
+        confidence = 1.0 - distance  # Convert distance to confidence score
+
+        # Check if this is a new user (different from last identified)
+        is_new_user = (self.last_identified_user != identified_name)
+
+        # Generate greeting message only for new users
+        greeting_message = None
+        if is_new_user:
+            greeting_message = f"Hello, {identified_name}! Nice to see you."
+            self.last_identified_user = identified_name
+            logger.info(f"New user identified: {identified_name} (confidence: {confidence:.2f})")
+        else:
+            logger.info(f"Same user detected: {identified_name} (confidence: {confidence:.2f})")
 
-        except Exception as e:
-            logger.error(f"Error during face identification: {e}")
-            return {
-                "name": None,
-                "confidence": 0.0,
-                "is_new_user": False,
-                "greeting_message": None,
-                "error": f"Error during identification: {str(e)}"
-            }
+        return {
+            "name": identified_name,
+            "confidence": float(confidence),
+            "is_new_user": is_new_user,
+            "greeting_message": greeting_message
+        }
 
     def reset_current_user(self):
         """Reset the currently identified user (useful for testing or manual reset)"""
         self.last_identified_user = None
+        self._sticky_match = None
         logger.info("Current user reset")
 
     def reload_profiles(self):
@@ -257,6 +489,18 @@ class FaceRecognitionService:
         }
 
 
+def _box_iou(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> float:
+    """Intersection over union of two (top, right, bottom, left) face boxes"""
+    height = min(a[2], b[2]) - max(a[0], b[0])
+    width = min(a[1], b[1]) - max(a[3], b[3])
+    if height <= 0 or width <= 0:
+        return 0.0
+    intersection = height * width
+    area_a = (a[2] - a[0]) * (a[1] - a[3])
+    area_b = (b[2] - b[0]) * (b[1] - b[3])
+    return intersection / float(area_a + area_b - intersection)
+
+
 # Global instance
 _face_recognition_service: Optional[FaceRecognitionService] = None
 
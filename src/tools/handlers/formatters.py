@@ -7,6 +7,9 @@ Contains helper functions for formatting Pokemon data and building responses.
 from typing import Dict, Any, Optional
 import re
 
+# Matches the "# Name (#25)" heading emitted in text content results
+_POKEMON_IDENTITY_RE = re.compile(r"#\s*(.+?)\s*\(#(\d+)\)")
+
 
 def build_pokemon_assistant_text(pokemon_info: Dict[str, Any]) -> Optional[str]:
     """Generate the markdown-style assistant message for a Pokemon entry."""
@@ -71,7 +74,7 @@ def extract_pokemon_identity_from_content(result: Dict[str, Any]) -> Optional[Di
         if item.get('type') != 'text':
             continue
         text = item.get('text', '')
-        match = re.search(r"#\s*(.+?)\s*\(#(\d+)\)", text)
+        match = _POKEMON_IDENTITY_RE.search(text)
         if match:
             name = match.group(1).strip()
             try:
@@ -8,13 +8,14 @@ Handles all Pokemon data lookups via PokeAPI:
 """
 
 import random
-import requests
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 import logging
 
 from src.api import pokemon_api
 from src.tools.tool_manager import tool_manager
 from src.services.cache_service import get_cache_service
+from src.utils.http_session import get_http_session
+from src.utils.ttl_cache import TTLCache
 from .formatters import annotate_pokemon_result_with_text
 
 logger = logging.getLogger(__name__)
@@ -23,6 +24,23 @@ logger = logging.getLogger(__name__)
 pokemon_api_client = pokemon_api.PokemonTools()
 cache_service = get_cache_service()
 
+# Region to Pokemon ID ranges (approximate)
+REGION_RANGES = {
+    "kanto": (1, 151),
+    "johto": (152, 251),
+    "hoenn": (252, 386),
+    "sinnoh": (387, 493),
+    "unova": (494, 649),
+    "kalos": (650, 721),
+    "alola": (722, 809),
+    "galar": (810, 905),
+    "paldea": (906, 1010)
+}
+VALID_REGIONS_TEXT = ', '.join(REGION_RANGES)
+
+# Pokemon names per type, so a random pick doesn't re-read the full /type payload each time
+_type_rosters = TTLCache(maxsize=64)
+
 
 def handle_get_pokemon(pokemon_name: str) -> Dict[str, Any]:
     """
@@ -34,8 +52,11 @@ def handle_get_pokemon(pokemon_name: str) -> Dict[str, Any]:
     Returns:
         Dictionary with Pokemon data or error
     """
+    # Normalize once; the same key drives the cache lookup and both API calls
+    normalized_name = pokemon_name.strip().lower()
+
     # Check cache first
-    cache_key_params = {"pokemon_name": pokemon_name.lower()}
+    cache_key_params = {"pokemon_name": normalized_name}
     cached_response = cache_service.get("get_pokemon", cache_key_params)
     if cached_response:
         logger.info(f"🎯 Returning cached Pokemon data for: {pokemon_name}")
@@ -47,9 +68,9 @@ def handle_get_pokemon(pokemon_name: str) -> Dict[str, Any]:
         return {"error": "Pokemon lookup tools are disabled. Please enable PokeAPI in Tools settings."}
     
     # Use direct PokeAPI
-    pokemon_info = pokemon_api_client.get_pokemon(pokemon_name)
+    pokemon_info = pokemon_api_client.get_pokemon(normalized_name)
     if pokemon_info:
-        species_info = pokemon_api_client.get_pokemon_species(pokemon_name)
+        species_info = pokemon_api_client.get_pokemon_species(normalized_name)
         formatted = pokemon_api_client.format_pokemon_info(pokemon_info, species_info)
         result = annotate_pokemon_result_with_text(formatted)
         # Cache the successful response
@@ -97,24 +118,11 @@ def handle_get_random_pokemon_from_region(region: str) -> Dict[str, Any]:
     if not use_pokeapi:
         return {"error": "Pokemon lookup tools are disabled"}
     
-    # Region to Pokemon ID ranges (approximate)
-    region_ranges = {
-        "kanto": (1, 151),
-        "johto": (152, 251),
-        "hoenn": (252, 386),
-        "sinnoh": (387, 493),
-        "unova": (494, 649),
-        "kalos": (650, 721),
-        "alola": (722, 809),
-        "galar": (810, 905),
-        "paldea": (906, 1010)
-    }
-    
-    region_lower = region.lower()
-    if region_lower not in region_ranges:
-        return {"error": f"Unknown region: {region}. Valid regions: {', '.join(region_ranges.keys())}"}
+    region_range = REGION_RANGES.get(region.strip().lower())
+    if region_range is None:
+        return {"error": f"Unknown region: {region}. Valid regions: {VALID_REGIONS_TEXT}"}
     
-    start_id, end_id = region_ranges[region_lower]
+    start_id, end_id = region_range
     random_id = random.randint(start_id, end_id)
     pokemon_data = pokemon_api_client.get_pokemon(str(random_id))
     if pokemon_data:
@@ -126,6 +134,30 @@ def handle_get_random_pokemon_from_region(region: str) -> Dict[str, Any]:
     return {"error": f"Failed to get random Pokemon from {region}"}
 
 
+def _get_type_roster(type_name: str) -> Optional[Tuple[str, ...]]:
+    """
+    Names of every Pokemon of a type, or None if PokeAPI doesn't know the type.
+    Reads the pokeapi_type cache entry (filled by the PokeAPI proxy and
+    scripts/03-preload_pokeapi_cache.py) before falling back to the API.
+    """
+    roster = _type_rosters.get(type_name)
+    if roster is not None:
+        return roster
+
+    cache_key_params = {"type": type_name}
+    type_data = cache_service.get("pokeapi_type", cache_key_params)
+    if type_data is None:
+        response = get_http_session().get(f"https://pokeapi.co/api/v2/type/{type_name}", timeout=10)
+        if response.status_code != 200:
+            return None
+        type_data = response.json()
+        cache_service.set("pokeapi_type", cache_key_params, type_data)
+
+    roster = tuple(entry["pokemon"]["name"] for entry in type_data.get("pokemon", []))
+    _type_rosters.set(type_name, roster)
+    return roster
+
+
 def handle_get_random_pokemon_by_type(pokemon_type: str) -> Dict[str, Any]:
     """
     Handler for get_random_pokemon_by_type tool - returns a random Pokemon of a specific type.
@@ -142,13 +174,10 @@ def handle_get_random_pokemon_by_type(pokemon_type: str) -> Dict[str, Any]:
         return {"error": "Pokemon lookup tools are disabled"}
     
     try:
-        response = requests.get(f"https://pokeapi.co/api/v2/type/{pokemon_type.lower()}", timeout=10)
-        if response.status_code == 200:
-            type_data = response.json()
-            pokemon_list = type_data.get("pokemon", [])
-            if pokemon_list:
-                random_pokemon = random.choice(pokemon_list)
-                pokemon_name = random_pokemon["pokemon"]["name"]
+        roster = _get_type_roster(pokemon_type.lower())
+        if roster is not None:
+            if roster:
+                pokemon_name = random.choice(roster)
                 pokemon_data = pokemon_api_client.get_pokemon(pokemon_name)
                 if pokemon_data:
                     species_info = pokemon_api_client.get_pokemon_species(pokemon_name)
@@ -26,6 +26,11 @@ from src.tools.handlers import (
 
 logger = logging.getLogger(__name__)
 
+# Function names exposed to the models that differ from the dispatcher's tool names
+TOOL_NAME_MAP = {
+    'get_pokemon_info': 'get_pokemon',
+}
+
 
 # ============= Unified Tool Dispatcher =============
 
@@ -3,11 +3,14 @@ Tool Manager for Pokemon Chat Application
 Manages available tools and their enabled/disabled states
 """
 import json
+import logging
 import os
 from typing import Dict, List, Optional, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+logger = logging.getLogger(__name__)
+
 
 class ToolCategory(Enum):
     """Categories for organizing tools"""
@@ -73,6 +76,9 @@ class ToolManager:
         """
         self.config_path = config_path or os.path.join(os.path.dirname(__file__), "tools_config.json")
         self.tools: Dict[str, Tool] = {}
+        # Bumped on every change so callers can cache anything derived from tool states
+        self.version = 0
+        self._enabled: Dict[str, bool] = {}
         self._load_tools()
     
     def _load_tools(self):
@@ -90,7 +96,13 @@ class ToolManager:
                         if tool_id in self.tools:
                             self.tools[tool_id].enabled = enabled
             except (json.JSONDecodeError, IOError) as e:
-                print(f"Error loading tools config: {e}")
+                logger.error("Error loading tools config: %s", e)
+        self._mark_changed()
+    
+    def _mark_changed(self):
+        """Refresh the enabled-state lookup and bump the version after any change"""
+        self._enabled = {tool_id: tool.enabled for tool_id, tool in self.tools.items()}
+        self.version += 1
     
     def _save_tools(self):
         """Save tool enabled states to config file"""
@@ -99,7 +111,7 @@ class ToolManager:
             with open(self.config_path, 'w') as f:
                 json.dump(config, f, indent=2)
         except IOError as e:
-            print(f"Error saving tools config: {e}")
+            logger.error("Error saving tools config: %s", e)
     
     def get_tool(self, tool_id: str) -> Optional[Tool]:
         """Get a specific tool by ID"""
@@ -119,8 +131,7 @@ class ToolManager:
     
     def is_tool_enabled(self, tool_id: str) -> bool:
         """Check if a specific tool is enabled"""
-        tool = self.tools.get(tool_id)
-        return tool.enabled if tool else False
+        return self._enabled.get(tool_id, False)
     
     def set_tool_enabled(self, tool_id: str, enabled: bool) -> bool:
         """
@@ -137,6 +148,7 @@ class ToolManager:
             return False
         
         self.tools[tool_id].enabled = enabled
+        self._mark_changed()
         self._save_tools()
         return True
     
@@ -160,6 +172,7 @@ class ToolManager:
         for tool_id, default_tool in self.DEFAULT_TOOLS.items():
             if tool_id in self.tools:
                 self.tools[tool_id].enabled = default_tool.enabled
+        self._mark_changed()
         self._save_tools()
     
     def register_tool(self, tool: Tool) -> bool:
@@ -176,6 +189,7 @@ class ToolManager:
             return False
         
         self.tools[tool.id] = tool
+        self._mark_changed()
         self._save_tools()
         return True
     
@@ -1,8 +1,10 @@
 """Utility helpers for resolving API credential payloads from the client."""
 import os
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
 APP_API_PASSWORD = os.getenv('APP_API_PASSWORD', 'Password1')
+ENV_TCG_API_KEY = str(os.getenv('POKEMON_TCG_API_KEY', '')).strip()
 
 
 def _sanitize_endpoint(value: str) -> str:
@@ -17,7 +19,8 @@ def _require_fields(values: Dict[str, str], name: str) -> None:
         raise ValueError(f"Missing {name} field(s): {', '.join(missing)}")
 
 
-def _resolve_env_chat_config() -> Dict[str, str]:
+@lru_cache(maxsize=1)
+def _load_env_chat_config() -> Dict[str, str]:
     chat_endpoint = _sanitize_endpoint(os.getenv('AZURE_OPENAI_ENDPOINT', ''))
     chat_key = os.getenv('AZURE_OPENAI_API_KEY', '').strip()
     chat_deployment = os.getenv('AZURE_OPENAI_DEPLOYMENT', '').strip()
@@ -38,7 +41,8 @@ def _resolve_env_chat_config() -> Dict[str, str]:
     }
 
 
-def _resolve_env_realtime_config() -> Dict[str, str]:
+@lru_cache(maxsize=1)
+def _load_env_realtime_config() -> Dict[str, str]:
     realtime_endpoint = _sanitize_endpoint(
         os.getenv('AZURE_OPENAI_REALTIME_ENDPOINT', os.getenv('AZURE_OPENAI_ENDPOINT', ''))
     )
@@ -61,6 +65,15 @@ def _resolve_env_realtime_config() -> Dict[str, str]:
     }
 
 
+def resolve_env_chat_config() -> Dict[str, str]:
+    # Environment doesn't change at runtime; read and validate it once, hand out copies
+    return dict(_load_env_chat_config())
+
+
+def _resolve_env_realtime_config() -> Dict[str, str]:
+    return dict(_load_env_realtime_config())
+
+
 def _resolve_custom_chat_config(custom: Dict[str, Any]) -> Dict[str, str]:
     chat_endpoint = _sanitize_endpoint(str(custom.get('chat_endpoint', '')).strip())
     chat_key = str(custom.get('chat_api_key', '')).strip()
@@ -107,9 +120,8 @@ def _resolve_tcg_config(override_key: Optional[str] = None, *, allow_env_fallbac
     if key:
         return {'api_key': key}
     if allow_env_fallback:
-        env_key = str(os.getenv('POKEMON_TCG_API_KEY', '')).strip()
-        if env_key:
-            return {'api_key': env_key}
+        if ENV_TCG_API_KEY:
+            return {'api_key': ENV_TCG_API_KEY}
     return None
 
 
@@ -126,10 +138,10 @@ def resolve_api_settings(payload: Optional[Dict[str, Any]], *, require_chat: boo
         if password != APP_API_PASSWORD:
             raise ValueError('Invalid API access password.')
         if require_chat:
-            settings['chat'] = _resolve_env_chat_config()
+            settings['chat'] = resolve_env_chat_config()
         else:
             try:
-                settings['chat'] = _resolve_env_chat_config()
+                settings['chat'] = resolve_env_chat_config()
             except ValueError:
                 pass
         if require_realtime:
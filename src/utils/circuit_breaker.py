@@ -0,0 +1,83 @@
+"""
+Minimal circuit breaker for upstream services
+Stops sending requests to an upstream that keeps failing so workers aren't tied up waiting on timeouts
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` failures within `window` seconds and rejects calls
+    for `cooldown` seconds. After the cooldown it is half-open: a single probe call is let
+    through, and the circuit closes if it succeeds or reopens for another cooldown if it fails.
+    A probe that never reports back frees its slot after one cooldown.
+    """
+
+    def __init__(self, failure_threshold: int = 3, window: float = 30, cooldown: float = 10):
+        """
+        Initialize the breaker
+
+        Args:
+            failure_threshold: Failures within the window that open the circuit
+            window: Seconds over which failures are counted
+            cooldown: Seconds the circuit stays open before a probe call is allowed
+        """
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.cooldown = cooldown
+        self._failures: deque = deque()
+        self._open_until = 0.0
+        self._probe_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return False while the circuit is open, or half-open with a probe already in flight"""
+        if self._open_until == 0.0:
+            return True
+        now = time.monotonic()
+        if now < self._open_until:
+            return False
+        with self._lock:
+            if self._open_until == 0.0:
+                return True
+            if self._probe_started is not None and now - self._probe_started < self.cooldown:
+                return False
+            self._probe_started = now
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures.clear()
+            self._open_until = 0.0
+            self._probe_started = None
+
+    def record_failure(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self._probe_started is not None:
+                # The probe failed; stay open for another cooldown
+                self._probe_started = None
+                self._open_until = now + self.cooldown
+                return
+            self._failures.append(now)
+            while self._failures and now - self._failures[0] > self.window:
+                self._failures.popleft()
+            if len(self._failures) >= self.failure_threshold:
+                self._open_until = now + self.cooldown
+                self._failures.clear()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Get or create the process-wide breaker for an upstream (e.g. an Azure endpoint)"""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(name, CircuitBreaker())
+    return breaker
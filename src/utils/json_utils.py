@@ -0,0 +1,57 @@
+"""
+JSON helpers backed by orjson
+"""
+import typing as t
+
+import orjson
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that serializes with orjson.
+    Installed on the app so jsonify() and request.get_json() use it for both directions.
+    """
+
+    def _options(self, sort_keys: bool, indent: bool) -> int:
+        # Tool results can be keyed by ints (e.g. Pokemon IDs), which stdlib json allowed
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps_bytes(self, obj: t.Any, **kwargs: t.Any) -> bytes:
+        """Serialize obj to UTF-8 JSON bytes"""
+        option = self._options(kwargs.get('sort_keys', self.sort_keys), bool(kwargs.get('indent')))
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option)
+
+    def dumps(self, obj: t.Any, **kwargs: t.Any) -> str:
+        return self.dumps_bytes(obj, **kwargs).decode('utf-8')
+
+    def loads(self, s: t.Union[str, bytes], **kwargs: t.Any) -> t.Any:
+        return orjson.loads(s)
+
+    def response(self, *args: t.Any, **kwargs: t.Any):
+        """Build a JSON response straight from orjson bytes, skipping the str round trip"""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._options(self.sort_keys, indent))
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
+
+def json_body() -> t.Dict[str, t.Any]:
+    """
+    Parse the current request body as a JSON object with orjson.
+    Returns {} for empty, malformed or non-object bodies so routes can validate fields directly.
+    """
+    raw = request.get_data(cache=False)
+    if not raw:
+        return {}
+    try:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return {}
+    return data if isinstance(data, dict) else {}
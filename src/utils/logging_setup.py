@@ -0,0 +1,58 @@
+"""
+Logging setup that keeps handler I/O off request threads
+
+Request threads only put records on an in-memory queue; a single background
+listener thread formats them and writes to stderr.
+"""
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+def _restart_listener_in_child():
+    """Forked workers (gunicorn) inherit the listener but not its thread, so replace it with a fresh one"""
+    global _listener
+    if _listener is not None:
+        # The inherited listener's thread is gone, so stopping it only marks it stopped
+        _listener.stop()
+        # Records still queued at fork time belong to the parent; don't write them twice
+        log_queue = queue.SimpleQueue()
+        _queue_handler.queue = log_queue
+        _listener = QueueListener(log_queue, *_listener.handlers,
+                                  respect_handler_level=_listener.respect_handler_level)
+        _listener.start()
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+
+def configure_logging(level: int = logging.INFO, fmt: str = DEFAULT_FORMAT):
+    """Route root logging through a QueueHandler. Safe to call more than once"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(fmt))
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    _queue_handler = QueueHandler(log_queue)
+    root.addHandler(_queue_handler)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_stop_listener)
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=_restart_listener_in_child)
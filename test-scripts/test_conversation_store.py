@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for the conversation stores' payload window
+Runs against the in-memory store, and against Redis too when REDIS_URL is set
+"""
+
+import os
+import sys
+import uuid
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services import conversation_store
+from src.services.conversation_store import InMemoryConversationStore, RedisConversationStore
+
+
+def _entry(index):
+    return {"role": "assistant", "content": f"reply {index}", "timestamp": float(index),
+            "pokemon_data": {"id": index}, "tcg_data": None}
+
+
+def _check_payload_window(store, user_id, window):
+    """Append five entries with the given HISTORY_PAYLOAD_MESSAGES and check who kept payloads"""
+    previous = conversation_store.HISTORY_PAYLOAD_MESSAGES
+    conversation_store.HISTORY_PAYLOAD_MESSAGES = window
+    try:
+        for index in range(5):
+            store.append(user_id, _entry(index))
+    finally:
+        conversation_store.HISTORY_PAYLOAD_MESSAGES = previous
+
+    history = store.history(user_id)
+    assert [entry["content"] for entry in history] == [f"reply {index}" for index in range(5)], \
+        f"History order or content changed: {history}"
+    with_payloads = [entry["timestamp"] for entry in history if entry.get("pokemon_data") is not None]
+    expected = [float(index) for index in range(5 - window, 5)] if window > 0 else []
+    assert with_payloads == expected, f"window={window}: expected payloads on {expected}, got {with_payloads}"
+
+
+def test_in_memory_payload_window():
+    """The newest HISTORY_PAYLOAD_MESSAGES entries keep their payloads, including a window of 0"""
+    print("Testing in-memory payload window...")
+    for window in (0, 1, 3):
+        _check_payload_window(InMemoryConversationStore(), "user", window)
+        print(f"  ✓ HISTORY_PAYLOAD_MESSAGES={window}")
+
+
+def test_redis_payload_window():
+    """Same checks against Redis; skipped unless REDIS_URL points at a server"""
+    print("Testing Redis payload window...")
+    url = os.getenv("REDIS_URL")
+    if not url:
+        print("  - Skipped (REDIS_URL not set)")
+        return
+    store = RedisConversationStore(url)
+    for window in (0, 1, 3):
+        user_id = f"test-{uuid.uuid4().hex}"
+        try:
+            _check_payload_window(store, user_id, window)
+        finally:
+            store._client.delete(f"conv:{user_id}")
+        print(f"  ✓ HISTORY_PAYLOAD_MESSAGES={window}")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Conversation Store - Test Suite")
+    print("=" * 60)
+
+    try:
+        test_in_memory_payload_window()
+        test_redis_payload_window()
+
+        print("\n" + "=" * 60)
+        print("✓ All tests passed!")
+        print("=" * 60)
+        return 0
+
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())